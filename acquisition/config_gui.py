@@ -14,20 +14,23 @@ class ConfigWindow:
     - User enters exposure, average, dark subtraction, etc.
     - On "Apply / Start" a SpectrometerConfig is built and passed
       to the ConfigManager via set_config().
+    - 'initial' pre-fills the fields (e.g. the config a restarted
+      process was started with); otherwise SpectrometerConfig defaults.
     """
 
-    def __init__(self, manager: ConfigManager) -> None:
+    def __init__(self, manager: ConfigManager, initial: Optional[SpectrometerConfig] = None) -> None:
         self._manager = manager
+        cfg = initial if initial is not None else SpectrometerConfig()
 
         self._root = tk.Tk()
         self._root.title("SPM-002 Configuration (x32)")
 
         # Tk variables
-        self._exposure_var = tk.StringVar(value="50.0")   # ms
-        self._average_var = tk.StringVar(value="1")
-        self._dark_var = tk.IntVar(value=0)               # 0/1
-        self._mode_var = tk.StringVar(value="0")
-        self._scan_delay_var = tk.StringVar(value="0")
+        self._exposure_var = tk.StringVar(value=str(cfg.exposure_ms))   # ms
+        self._average_var = tk.StringVar(value=str(cfg.average))
+        self._dark_var = tk.IntVar(value=int(cfg.dark_subtraction))     # 0/1
+        self._mode_var = tk.StringVar(value=str(cfg.mode))
+        self._scan_delay_var = tk.StringVar(value=str(cfg.scan_delay))
 
         self._build_ui()
 
@@ -1,10 +1,16 @@
 # acquisition/json_stream_server.py
+import argparse
 import json
+import os
+import sys
 import threading
+import time
+import traceback
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Tuple
 
 from .spm002 import Spectrometer, SpectrometerConfig, SpectrumData
+from .spm002.dll import get_lib
 from .runtime_config import ConfigManager
 from .config_gui import ConfigWindow
 
@@ -19,10 +25,26 @@ def spectrum_to_frame(spectrum: SpectrumData) -> Dict:
         "timestamp": spectrum.timestamp.isoformat(),
         "device_index": spectrum.device_index,
         "counts": spectrum.counts,
+        # time.monotonic() at start/end of the exposure, used to skip frames taken during rotator moves
+        "acq_start": spectrum.acquisition_start,
+        "acq_end": spectrum.acquisition_end,
         # wavelengths are static and sent once in the 'meta' message
     }
 
 
+def config_from_message(message: Dict) -> SpectrometerConfig:
+    """Inverse of config_to_message(); missing fields keep their defaults."""
+    defaults = SpectrometerConfig()
+    return SpectrometerConfig(
+        device_index=int(message.get("device_index", defaults.device_index)),
+        exposure_ms=float(message.get("exposure_ms", defaults.exposure_ms)),
+        average=int(message.get("average", defaults.average)),
+        dark_subtraction=int(message.get("dark_subtraction", defaults.dark_subtraction)),
+        mode=int(message.get("mode", defaults.mode)),
+        scan_delay=int(message.get("scan_delay", defaults.scan_delay)),
+    )
+
+
 def config_to_message(config: SpectrometerConfig) -> Dict:
     """
     Convert the current SpectrometerConfig to a JSON-serializable dict.
@@ -41,17 +63,20 @@ def config_to_message(config: SpectrometerConfig) -> Dict:
     }
 
 
-def meta_from_first_spectrum(spectrum: SpectrumData) -> Dict:
+def meta_from_first_spectrum(spectrum: SpectrumData, startup: List[Tuple[str, float]]) -> Dict:
     """
     Build the static 'meta' message from the first acquired spectrum.
 
-    Only contains properties that do not change during the run.
+    Only contains properties that do not change during the run, plus the
+    time.monotonic() of this process's startup steps (system-wide clock,
+    so the client can put them on its own startup timeline).
     """
     return {
         "type": "meta",
         "device_index": spectrum.device_index,
         "num_pixels": len(spectrum),
         "wavelengths": spectrum.wavelengths,  # may be None
+        "startup": startup,
     }
 
 
@@ -59,23 +84,36 @@ def meta_from_first_spectrum(spectrum: SpectrumData) -> Dict:
 # Acquisition loop (runs in background thread)
 # ---------------------------------------------------------------------------
 
-def acquisition_loop(manager: ConfigManager, stop_event: threading.Event) -> None:
+def acquisition_loop(
+    manager: ConfigManager,
+    stop_event: threading.Event,
+    startup: List[Tuple[str, float]],
+) -> None:
     """
     Background thread that:
+    - loads PhotonSpectr.dll while the operator is still in the GUI
     - waits for an initial configuration from the GUI
     - opens the spectrometer with that config
     - sends one 'meta' message
     - sends a 'config' message whenever the config changes
     - continuously acquires spectra and sends 'frame' messages
     """
+    # 0) Load the DLL now; the package itself only loads it on first use
+    get_lib()
+    startup.append(("acquisition: DLL loaded", time.monotonic()))
+
     # 1) Wait for the first configuration from the GUI
     current_config = manager.wait_for_initial_config()
+    startup.append(("acquisition: config received", time.monotonic()))
 
     with Spectrometer(config=current_config) as spectrometer:
+        startup.append(("acquisition: device open", time.monotonic()))
+
         # 2) Acquire one spectrum to build static META info
         first = spectrometer.acquire_spectrum()
+        startup.append(("acquisition: first spectrum", time.monotonic()))
 
-        meta = meta_from_first_spectrum(first)
+        meta = meta_from_first_spectrum(first, startup)
         print(json.dumps(meta), flush=True)
 
         # 3) Send initial CONFIG message
@@ -107,25 +145,38 @@ def main() -> None:
     """
     Entry point for the 32-bit acquisition process.
 
+    - With --config (a 'config' message as JSON, sent by the client when
+      it restarts this process) acquisition starts right away with it
+      instead of waiting for "Apply / Start"
     - Creates a ConfigManager and a stop_event
     - Starts the acquisition_loop in a background thread
     - Opens the Tk configuration window in the main thread
     - When the window is closed, the stop_event is set and the
       acquisition thread is joined for a short time.
     """
+    startup = [("acquisition: process started", time.monotonic())]
+    parser = argparse.ArgumentParser(description="SPM-002 JSON stream server")
+    parser.add_argument("--config", default=None, help="initial configuration as a JSON 'config' message")
+    args = parser.parse_args()
+
     manager = ConfigManager()
     stop_event = threading.Event()
 
+    initial_config = None
+    if args.config is not None:
+        initial_config = config_from_message(json.loads(args.config))
+        manager.set_config(initial_config)
+
     worker = threading.Thread(
-        target=acquisition_loop,
-        args=(manager, stop_event),
+        target=_run_acquisition,
+        args=(manager, stop_event, startup),
         name="SPM002_AcquisitionThread",
         daemon=True,
     )
     worker.start()
 
     # Run the configuration UI in the main thread
-    window = ConfigWindow(manager)
+    window = ConfigWindow(manager, initial=initial_config)
     window.run()  # blocks until the window is closed
 
     # When the window is closed, stop the acquisition loop
@@ -133,6 +184,24 @@ def main() -> None:
     worker.join(timeout=2.0)
 
 
+def _run_acquisition(
+    manager: ConfigManager,
+    stop_event: threading.Event,
+    startup: List[Tuple[str, float]],
+) -> None:
+    """
+    acquisition_loop; on an error (e.g. DLL or device missing) the whole
+    process exits, so the client sees the stream end instead of waiting
+    for 'meta' while the GUI stays open.
+    """
+    try:
+        acquisition_loop(manager, stop_event, startup)
+    except Exception:
+        traceback.print_exc(file=sys.stderr)
+        sys.stderr.flush()
+        os._exit(1)
+
+
 if __name__ == "__main__":
     # IMPORTANT: this module is started as:
     #   python -m acquisition.json_stream_server
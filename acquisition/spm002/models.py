@@ -17,6 +17,7 @@ class SpectrumData:
     - pixel indices
     - raw counts
     - optional wavelength axis (if LUT is available)
+    - start/end of the exposure on the time.monotonic() clock
     """
     timestamp: datetime
     config: SpectrometerConfig
@@ -25,6 +26,9 @@ class SpectrumData:
     counts: List[int]
     wavelengths: Optional[List[float]]  # None if LUT is not available
 
+    acquisition_start: Optional[float] = None
+    acquisition_end: Optional[float] = None
+
     @property
     def device_index(self) -> int:
         return self.config.device_index
@@ -54,6 +58,8 @@ class SpectrumData:
         counts: Sequence[int],
         wavelengths: Optional[Sequence[float]],
         config: SpectrometerConfig,
+        acquisition_start: Optional[float] = None,
+        acquisition_end: Optional[float] = None,
     ) -> "SpectrumData":
         pixels = list(range(len(counts)))
 
@@ -68,4 +74,6 @@ class SpectrumData:
             pixels=pixels,
             counts=list(counts),
             wavelengths=wl_list,
+            acquisition_start=acquisition_start,
+            acquisition_end=acquisition_end,
         )
@@ -1,8 +1,9 @@
 # acquisition/spm002/spectrometer.py
 from typing import Optional, List
 import ctypes as ct
+import time
 
-from .dll import lib, c_int, c_ushort
+from .dll import get_lib, c_int, c_ushort
 from .config import SpectrometerConfig
 from .models import SpectrumData
 from .exceptions import SpectrometerError
@@ -88,7 +89,7 @@ class Spectrometer:
         if self._is_open:
             return
 
-        num_devices = lib.PHO_EnumerateDevices()
+        num_devices = get_lib().PHO_EnumerateDevices()
         if num_devices <= 0:
             raise SpectrometerError("No spectrometer detected.")
 
@@ -98,20 +99,20 @@ class Spectrometer:
                 f"Number of detected devices: {num_devices}"
             )
 
-        if lib.PHO_Open(self.device_index) == 0:
+        if get_lib().PHO_Open(self.device_index) == 0:
             raise SpectrometerError("PHO_Open failed.")
 
         # Query number of pixels
         num_pixels = c_int()
-        if lib.PHO_GetPn(self.device_index, ct.byref(num_pixels)) == 0:
-            lib.PHO_Close(self.device_index)
+        if get_lib().PHO_GetPn(self.device_index, ct.byref(num_pixels)) == 0:
+            get_lib().PHO_Close(self.device_index)
             raise SpectrometerError("PHO_GetPn failed.")
 
         self._num_pixels = num_pixels.value
 
         # Read LUT (optional)
         lut = (ct.c_float * 4)()
-        if lib.PHO_GetLut(self.device_index, lut, 4) == 0:
+        if get_lib().PHO_GetLut(self.device_index, lut, 4) == 0:
             # LUT not available → we just work with pixel indices
             self._wavelengths = None
         else:
@@ -130,7 +131,7 @@ class Spectrometer:
         if not self._is_open:
             return
 
-        if lib.PHO_Close(self.device_index) == 0:
+        if get_lib().PHO_Close(self.device_index) == 0:
             raise SpectrometerError("PHO_Close failed.")
 
         self._is_open = False
@@ -156,19 +157,19 @@ class Spectrometer:
         cfg = self.config
 
         # Exposure time
-        if lib.PHO_SetTime(self.device_index, float(cfg.exposure_ms)) == 0:
+        if get_lib().PHO_SetTime(self.device_index, float(cfg.exposure_ms)) == 0:
             raise SpectrometerError("PHO_SetTime failed.")
 
         # Averaging
-        if lib.PHO_SetAverage(self.device_index, int(cfg.average)) == 0:
+        if get_lib().PHO_SetAverage(self.device_index, int(cfg.average)) == 0:
             raise SpectrometerError("PHO_SetAverage failed.")
 
         # Dark subtraction
-        if lib.PHO_SetDs(self.device_index, int(cfg.dark_subtraction)) == 0:
+        if get_lib().PHO_SetDs(self.device_index, int(cfg.dark_subtraction)) == 0:
             raise SpectrometerError("PHO_SetDs failed.")
 
         # Mode (0 = continuous)
-        if lib.PHO_SetMode(self.device_index, int(cfg.mode), int(cfg.scan_delay)) == 0:
+        if get_lib().PHO_SetMode(self.device_index, int(cfg.mode), int(cfg.scan_delay)) == 0:
             raise SpectrometerError("PHO_SetMode failed.")
 
     def configure(self, config: Optional[SpectrometerConfig] = None) -> None:
@@ -201,8 +202,20 @@ class Spectrometer:
         buffer_type = c_ushort * npix
         spectrum_buffer = buffer_type()
 
-        if lib.PHO_Acquire(self.device_index, 0, npix, spectrum_buffer) == 0:
+        # monotonic clock: system-wide, so the 64-bit side can compare it with rotator motion
+        started = time.monotonic()
+        if get_lib().PHO_Acquire(self.device_index, 0, npix, spectrum_buffer) == 0:
             raise SpectrometerError("PHO_Acquire failed.")
+        finished = time.monotonic()
+
+        # In continuous mode (0) the device exposes all the time and
+        # PHO_Acquire returns the spectrum that is ready, which may have
+        # started up to exposure_ms * average before the call. Take that
+        # earliest possible start rather than the previous frame's end: the
+        # motion gate must never pass a frame partly exposed during a move,
+        # and dropping one clean frame too many is harmless.
+        if self.config.mode == 0:
+            started -= self.config.exposure_ms * self.config.average / 1000.0
 
         counts = [spectrum_buffer[i] for i in range(npix)]
 
@@ -210,4 +223,6 @@ class Spectrometer:
             counts=counts,
             wavelengths=self._wavelengths,
             config=self.config,
+            acquisition_start=started,
+            acquisition_end=finished,
         )
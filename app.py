@@ -1,27 +1,48 @@
 # phase_control/app.py
+import time
+
+_STARTED_AT = time.monotonic()
+
+import argparse
+import os
 import threading
-from typing import NoReturn
+from concurrent.futures import Future
+from pathlib import Path
+from typing import TYPE_CHECKING, NoReturn, Optional
 
-from phase_control.analysis.run_analysis import run_analysis
+from phase_control.correction_io.config import RotatorBackend, RotatorConfig
+from phase_control.correction_io.elliptec_ell14 import start_rotator
+from phase_control.domain.startup_timeline import StartupTimeline
 from phase_control.stream_io import (
     SpectrometerStreamClient,
     FrameBuffer,
     StreamFrame,
     StreamMeta,
 )
-from phase_control.analysis.plot import run_plot
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+_IMPORTED_AT = time.monotonic()
+
+# Loaded while the acquisition process starts up, one timeline entry each.
+# Everything else heavy (Thorlabs DLL, PhotonSpectr.dll) loads on first use.
+ANALYSIS_IMPORTS = ["scipy.optimize", "lmfit", "phase_control.analysis.control_loop"]
+GUI_IMPORTS = ["matplotlib.pyplot", "phase_control.analysis.run_analysis"]
 
 
 def reader_loop(
     client: SpectrometerStreamClient,
     buffer: FrameBuffer,
     stop_event: threading.Event,
+    timeline: Optional[StartupTimeline] = None,
 ) -> None:
     """
     Background thread function.
 
     - consumes frames from the SpectrometerStreamClient
     - updates the FrameBuffer with the latest frame
+    - marks the first frame on the startup timeline
     - exits when stop_event is set or the stream ends
     """
     try:
@@ -29,6 +50,9 @@ def reader_loop(
             if stop_event.is_set():
                 break
             buffer.update(frame)
+            if timeline is not None:
+                timeline.mark("first frame")
+                timeline = None
     finally:
         # Make sure the process is stopped even if the loop ends
         client.stop()
@@ -38,34 +62,153 @@ def main() -> None:
     """
     Application entry point:
 
-    - start stream client (32-bit acquisition process)
+    - start stream client (32-bit acquisition process); while it starts
+      up, connect and home the rotator (own thread), import the analysis
+      stack and open the plot window
     - create frame buffer
     - start reader thread
-    - run plot in main thread
+    - run plot in main thread (--headless: control loop with periodic
+      metrics; pyplot and the plotting modules are never imported, though
+      lmfit still loads matplotlib itself)
     """
+    parser = argparse.ArgumentParser(description="SPM-002 phase control")
+    parser.add_argument(
+        "--rotator",
+        choices=[b.value for b in RotatorBackend],
+        default=RotatorBackend.THORLABS.value,
+        help="Elliptec backend; 'simulated' runs without the Thorlabs DLL",
+    )
+    parser.add_argument(
+        "--calibrate",
+        action="store_true",
+        help="sweep the HWP after the first fit and store the phase/angle calibration",
+    )
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="no plot window; print one line of loop metrics every --metrics-interval seconds",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=10.0,
+        help="seconds between metrics lines in --headless mode",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        default=None,
+        help="append the --headless metrics to this file instead of stdout",
+    )
+    args = parser.parse_args()
+    rotator_config = RotatorConfig(backend=RotatorBackend(args.rotator))
+
+    timeline = StartupTimeline(origin=_STARTED_AT)
+    timeline.mark("app modules imported", at=_IMPORTED_AT)
+
+    # 1) acquisition process: loads its DLL, waits for the config window, opens the device
     client = SpectrometerStreamClient()
-    meta: StreamMeta = client.start()
+    client.launch()
+    timeline.mark("acquisition process launched")
+
+    # 2) rotator: connects and homes on its own thread meanwhile
+    rotator = start_rotator(rotator_config)
+    rotator.ready.add_done_callback(
+        lambda ready: timeline.mark(
+            "rotator connected and homed" if ready.exception() is None else "rotator failed to start"
+        )
+    )
+
+    try:
+        # 3) analysis stack and plot window on the main thread, then wait for meta
+        if args.headless:
+            # nothing here imports pyplot; keep anything that does off GUI backends
+            os.environ.setdefault("MPLBACKEND", "Agg")
+        timeline.import_modules(ANALYSIS_IMPORTS + ([] if args.headless else GUI_IMPORTS))
+
+        figure = None
+        if not args.headless:
+            from phase_control.analysis.run_analysis import create_figure
+
+            with timeline.measure("create figure"):
+                figure = create_figure()
+
+        with timeline.measure("wait for meta"):
+            meta: StreamMeta = _wait_for_meta(client, figure[0] if figure is not None else None)
+    except BaseException:
+        rotator.close()
+        client.stop()
+        raise
+    for label, at in meta.startup:
+        timeline.mark(label, at=at, source="acquisition")
 
     buffer = FrameBuffer(meta)
     stop_event = threading.Event()
 
     reader = threading.Thread(
         target=reader_loop,
-        args=(client, buffer, stop_event),
+        args=(client, buffer, stop_event, timeline),
         name="SpectrometerReaderThread",
         daemon=True,
     )
     reader.start()
 
     try:
-        # Run plotting in the main thread
-        run_analysis(buffer=buffer, stop_event=stop_event)
+        # the control loop takes over the rotator and prints the timeline at the first correctable frame
+        if args.headless:
+            from phase_control.analysis.run_headless import run_headless
+
+            run_headless(
+                buffer=buffer,
+                stop_event=stop_event,
+                rotator_config=rotator_config,
+                calibrate=args.calibrate,
+                interval=args.metrics_interval,
+                metrics_path=args.metrics_file,
+                rotator=rotator,
+                timeline=timeline,
+            )
+        else:
+            # Run plotting in the main thread; pyplot is only imported without --headless
+            from phase_control.analysis.run_analysis import run_analysis
+
+            run_analysis(
+                buffer=buffer,
+                stop_event=stop_event,
+                rotator_config=rotator_config,
+                calibrate=args.calibrate,
+                figure=figure,
+                rotator=rotator,
+                timeline=timeline,
+            )
     finally:
         # Tell reader to stop and clean up
         stop_event.set()
         reader.join(timeout=2.0)
+        rotator.close()
         client.stop()
 
 
+def _wait_for_meta(client: SpectrometerStreamClient, fig: "Optional[Figure]") -> StreamMeta:
+    """
+    client.read_meta(); with a plot window, the read runs on a helper
+    thread and the window keeps handling events until meta arrived.
+    """
+    if fig is None:
+        return client.read_meta()
+
+    result: "Future[StreamMeta]" = Future()
+
+    def read() -> None:
+        try:
+            result.set_result(client.read_meta())
+        except BaseException as exc:
+            result.set_exception(exc)
+
+    threading.Thread(target=read, name="MetaReaderThread", daemon=True).start()
+    while not result.done():
+        fig.canvas.start_event_loop(0.05)
+    return result.result()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,77 @@
+"""
+Fit time and phase error of binned / decimated spectra against the
+unbinned phase-only fit on recorded files.
+
+Run from the repository root:
+
+    python -m phase_control.Demo.bench_binning [spectrum file] [--frames N] [--factors 1 2 4 ...]
+"""
+import argparse
+import math
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+from phase_control.Demo.data_io.data_loader import load_spectra
+from phase_control.analysis.config import AnalysisConfig, BinningMode
+from phase_control.analysis.fit_engine import FitEngine
+from phase_control.analysis.phase_tracker import PhaseTracker
+from phase_control.domain.models import Spectrum
+
+DEFAULT_PATH = Path("Z:\\Droplets\\20251120\\Spectra_GA=26_DA=15p9\\spectrum-20-Nov-2025_121750 - both arms 10ms.txt")
+
+
+def track(spectra: list[Spectrum], config: AnalysisConfig) -> tuple[np.ndarray, np.ndarray]:
+    """Phases and per-frame update times (excluding the initial full fit)."""
+    tracker = PhaseTracker(config)
+    tracker.update(spectra[0])
+
+    phases = np.empty(len(spectra) - 1)
+    times = np.empty(len(spectra) - 1)
+    for i, s in enumerate(spectra[1:]):
+        t0 = time.perf_counter()
+        tracker.update(s)
+        times[i] = time.perf_counter() - t0
+        assert tracker.current_phase is not None
+        phases[i] = tracker.current_phase.Rad
+    return phases, times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", type=Path, default=DEFAULT_PATH)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--factors", type=int, nargs="+", default=[1, 2, 3, 4, 6, 8])
+    args = parser.parse_args()
+
+    base = AnalysisConfig()
+    spectra = [s.cut(base.wavelength_range) for s in load_spectra(args.path)][: args.frames]
+
+    # reference: unbinned fit, started from a converged full fit
+    engine = FitEngine()
+    start = AnalysisConfig.from_fit_result(base, engine.fit_full(spectra[0], base, max_nfev=10000))
+    reference, _ = track(spectra, replace(start, binning_factor=1))
+
+    print(f"{len(spectra)} frames, {len(spectra[0].intensity)} pixels unbinned")
+    print(f"{'mode':<9}{'k':>3}{'pixels':>8}{'median ms':>11}{'rms err °':>11}{'max err °':>11}{'std err °':>11}")
+
+    for mode in BinningMode:
+        for k in args.factors:
+            config = replace(start, binning_factor=k, binning_mode=mode)
+            phases, times = track(spectra, config)
+
+            # std err ignores the constant offset from a different initial fit
+            err = (phases - reference + 0.5 * math.pi) % math.pi - 0.5 * math.pi
+            err_deg = np.degrees(err)
+            pixels = len(spectra[0].binned(k).intensity) if mode is BinningMode.MEAN else len(spectra[0].decimated(k).intensity)
+
+            print(
+                f"{mode.value:<9}{k:>3}{pixels:>8}{np.median(times) * 1e3:>11.3f}"
+                f"{np.sqrt(np.mean(err_deg ** 2)):>11.3f}{np.abs(err_deg).max():>11.3f}{err_deg.std():>11.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Closed-loop lock acquisition against the simulated Elliptec backend.
+
+The spectrometer is replaced by a thread that writes usCFG spectra,
+synthesized from the default AnalysisConfig, into a FrameBuffer with
+exposure timestamps. Their phase drifts at --drift deg/s and follows the
+simulated HWP position with the gain PhaseCorrector assumes times
+--gain-error. Tracker, corrector, RotatorWorker and the buffer's motion
+filter run as in run_analysis, in real time.
+
+--calibrate runs the HWP calibration sweep first; lock statistics start
+after it.
+
+Run from the repository root:
+
+    python -m phase_control.Demo.bench_closed_loop [--duration s] [--start-error deg] [--gain-error f] [--calibrate]
+"""
+import argparse
+import math
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import replace
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+
+from base_lib.functions import usCFG_projection
+from base_lib.models import Angle, AngleUnit
+from phase_control.analysis.config import AnalysisConfig, CalibrationConfig
+from phase_control.analysis.hwp_calibration import HwpCalibrator
+from phase_control.analysis.phase_corrector import PHASE_TOLERANCE, STARTING_PHASE, PhaseCorrector
+from phase_control.analysis.phase_tracker import PhaseTracker
+from phase_control.correction_io.config import SimulatedRotatorConfig
+from phase_control.correction_io.elliptec_ell14 import ElliptecRotator
+from phase_control.correction_io.rotator_worker import RotatorWorker
+from phase_control.correction_io.simulated_elliptec import SimulatedElliptecBackend
+from phase_control.stream_io import FrameBuffer, StreamFrame, StreamMeta
+
+WAVELENGTHS_NM = np.arange(795.0, 810.0, 0.03)
+FULL_SCALE_COUNTS = 4000
+
+
+def wrapped_error_deg(phase_deg: float) -> float:
+    """Distance to STARTING_PHASE on the π-periodic sin² branch."""
+    return (phase_deg - STARTING_PHASE.Deg + 90.0) % 180.0 - 90.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=20.0, help="s of closed-loop control")
+    parser.add_argument("--exposure", type=float, default=0.01, help="s per frame")
+    parser.add_argument("--start-error", type=float, default=60.0, help="deg")
+    parser.add_argument("--drift", type=float, default=2.0, help="deg/s")
+    parser.add_argument("--gain-error", type=float, default=1.0, help="true / assumed HWP gain")
+    parser.add_argument("--noise", type=float, default=0.02, help="relative intensity noise")
+    parser.add_argument("--speed", type=float, default=SimulatedRotatorConfig.speed_deg_per_s, help="deg/s")
+    parser.add_argument("--settle", type=float, default=SimulatedRotatorConfig.settle_time, help="s")
+    parser.add_argument("--threshold", action="store_true", help="single-frame threshold corrector instead of the trend corrector")
+    parser.add_argument("--calibrate", action="store_true", help="run the HWP calibration sweep before closing the loop")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    config = replace(AnalysisConfig(), warm_start=None)
+    kwargs = config.to_fit_kwargs(usCFG_projection)
+
+    corrector = PhaseCorrector(trend=None) if args.threshold else PhaseCorrector()
+    # phase per HWP degree that the corrector assumes, and the simulated truth
+    assumed_gain = corrector.expected_phase_change(Angle(1, AngleUnit.DEG)).Deg
+    true_gain = assumed_gain * args.gain_error
+    start_phase_deg = STARTING_PHASE.Deg + args.start_error
+
+    sim = SimulatedElliptecBackend(SimulatedRotatorConfig(speed_deg_per_s=args.speed, settle_time=args.settle))
+    ell = RotatorWorker(lambda: ElliptecRotator(max_address="0", backend=sim), name="SimulatedRotatorThread")
+    ell.ready.result()
+
+    buffer = FrameBuffer(StreamMeta(device_index=0, num_pixels=len(WAVELENGTHS_NM), wavelengths=list(WAVELENGTHS_NM)))
+    buffer.set_motion_filter(ell.overlaps_motion)
+    stop_event = threading.Event()
+    t0 = time.monotonic()
+
+    def true_phase_deg(t: float) -> float:
+        return start_phase_deg + args.drift * (t - t0) + true_gain * sim.position_deg
+
+    # true phase at the end of each exposure, for the lock statistics
+    truth: list[tuple[float, float]] = []
+    truth_by_frame: dict[float, float] = {}
+
+    def acquire() -> None:
+        while not stop_event.is_set():
+            start = time.monotonic()
+            phase_start = true_phase_deg(start)
+            time.sleep(args.exposure)
+            end = time.monotonic()
+            phase_end = true_phase_deg(end)
+
+            # average over the exposure: a phase change during the frame smears the fringes
+            y = np.mean([usCFG_projection(WAVELENGTHS_NM, **{**kwargs, "phase": math.radians(p)}) for p in (phase_start, phase_end)], axis=0)
+            y = y * (1.0 + args.noise * rng.standard_normal(y.shape))
+            counts = np.round(FULL_SCALE_COUNTS * y).astype(int).tolist()
+
+            truth.append((end, phase_end))
+            truth_by_frame[start] = phase_end
+            buffer.update(StreamFrame(datetime.now().isoformat(), 0, counts, start, end, time.monotonic()))
+
+    source = threading.Thread(target=acquire, name="SyntheticSpectrometerThread", daemon=True)
+    source.start()
+
+    tracker = PhaseTracker(config)
+    pending_move: Optional[Future[Angle]] = None
+    loop_latency: list[float] = []
+    fit_offset: Optional[float] = None
+    control_start = math.inf
+
+    try:
+        while time.monotonic() < control_start + args.duration:
+            frame = buffer.wait_next(timeout=1.0)
+            if frame is None:
+                raise RuntimeError("synthetic source stopped")
+            assert frame.acquisition_start is not None
+            acquired_at = frame.acquisition_start
+            spectrum = buffer.to_spectrum(frame).cut(config.wavelength_range)
+
+            t_fit = time.perf_counter()
+            if pending_move is not None and pending_move.done():
+                if pending_move.exception() is None:
+                    tracker.expect_phase_shift(corrector.expected_phase_change(pending_move.result()))
+                    corrector.move_completed()
+                pending_move = None
+
+            tracker.update(spectrum)
+            assert tracker.current_phase is not None
+
+            if fit_offset is None:
+                # the full fit trades phase against the other parameters, so lock
+                # is judged on the fit's phase scale, not the synthesized one
+                fit_offset = wrapped_error_deg(tracker.current_phase.Deg - truth_by_frame[acquired_at] + STARTING_PHASE.Deg)
+                if args.calibrate:
+                    calibration = HwpCalibrator(CalibrationConfig()).run(ell, buffer, tracker)
+                    print(f"calibrated gain {calibration.phase_per_hwp_deg:.3f} deg/deg (true {true_gain:.3f}), "
+                          f"residual {calibration.residual_deg:.2f}°")
+                    corrector.calibration = calibration
+                control_start = time.monotonic()
+                continue
+
+            correction_angle = corrector.update(tracker.current_phase, timestamp=acquired_at)
+            if float(correction_angle) != 0.0:
+                move = ell.request_rotation(correction_angle, acquired_at=acquired_at)
+                if move is not None:
+                    pending_move = move
+            loop_latency.append(time.perf_counter() - t_fit)
+    finally:
+        stop_event.set()
+        source.join(timeout=1.0)
+        ell.close()
+        tracker.close()
+
+    assert fit_offset is not None
+    samples = [(t, wrapped_error_deg(p + fit_offset)) for t, p in truth if t >= control_start]
+    t = np.asarray([s[0] for s in samples]) - control_start
+    err = np.abs(np.asarray([s[1] for s in samples]))
+    locked = err <= PHASE_TOLERANCE.Deg
+    outside = np.flatnonzero(~locked)
+    if len(outside) == 0:
+        lock_time = 0.0
+    elif outside[-1] + 1 < len(t):
+        lock_time = float(t[outside[-1] + 1])
+    else:
+        lock_time = math.nan
+
+    rotator = ell.ready.result()
+    latencies = np.asarray(rotator.move_latencies[1:])  # first entry is homing
+
+    print(f"{len(t)} frames in {args.duration:g} s, start error {args.start_error:g}°, drift {args.drift:g}°/s, gain error x{args.gain_error:g}")
+    print(f"  locked for good after  {lock_time:6.2f} s")
+    print(f"  time locked            {100 * locked.mean():6.1f} %")
+    print(f"  mean |error|           {err.mean():6.2f}°   (last 25 %: {err[3 * len(err) // 4:].mean():.2f}°)")
+    print(f"  moves {ell.moves}, dropped requests {ell.dropped}, below min step {ell.skipped_small}")
+    print(f"  frames skipped in motion {buffer.skipped_in_motion}")
+    if len(latencies):
+        print(f"  move latency           {1e3 * np.median(latencies):6.1f} ms median, {1e3 * latencies.max():.1f} ms max")
+    print(f"  fit + correction       {1e3 * np.median(loop_latency):6.2f} ms median")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Per-frame phase fit overhead: rebuilding the lmfit model every frame
+(previous PhaseTracker behaviour) vs. the persistent FitEngine.
+
+Run from the repository root:
+
+    python -m phase_control.Demo.bench_fit_engine [spectrum file] [--frames N]
+"""
+import argparse
+import inspect
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import lmfit
+import numpy as np
+
+from base_lib.functions import usCFG_projection
+from phase_control.Demo.data_io.data_loader import load_spectra
+from phase_control.analysis.config import AnalysisConfig
+from phase_control.analysis.fit_engine import FitEngine
+from phase_control.domain.models import Spectrum
+
+DEFAULT_PATH = Path("Z:\\Droplets\\20251120\\Spectra_GA=26_DA=15p9\\spectrum-20-Nov-2025_121750 - both arms 10ms.txt")
+
+
+def fit_phase_rebuild(spectrum: Spectrum, config: AnalysisConfig) -> AnalysisConfig:
+    """The per-frame phase fit as done before FitEngine existed."""
+    first_arg_name = next(iter(inspect.signature(usCFG_projection).parameters))
+    model = lmfit.Model(usCFG_projection, independent_vars=[first_arg_name])
+
+    params = model.make_params(**config.to_fit_kwargs(usCFG_projection))
+    for name, par in params.items():
+        par.vary = (name == "phase")
+
+    result = model.fit(spectrum.intensity, params=params, **{first_arg_name: spectrum.wavelengths_nm})
+    return AnalysisConfig.from_fit_result(config, result)
+
+
+def fit_phase_engine(engine: FitEngine) -> Callable[[Spectrum, AnalysisConfig], AnalysisConfig]:
+    def fit(spectrum: Spectrum, config: AnalysisConfig) -> AnalysisConfig:
+        return AnalysisConfig.from_fit_result(config, engine.fit_phase(spectrum, config))
+    return fit
+
+
+def run(spectra: list[Spectrum], config: AnalysisConfig, fit: Callable[..., Any]) -> np.ndarray:
+    times = np.empty(len(spectra))
+    for i, s in enumerate(spectra):
+        t0 = time.perf_counter()
+        config = fit(s, config)
+        times[i] = time.perf_counter() - t0
+    return times
+
+
+def report(name: str, times: np.ndarray) -> None:
+    ms = times * 1e3
+    print(f"{name:<10} mean {ms.mean():7.3f} ms   median {np.median(ms):7.3f} ms   p95 {np.percentile(ms, 95):7.3f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", type=Path, default=DEFAULT_PATH)
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    config = AnalysisConfig()
+    spectra = [s.cut(config.wavelength_range) for s in load_spectra(args.path)][: args.frames]
+
+    engine = FitEngine()
+    start = AnalysisConfig.from_fit_result(config, engine.fit_full(spectra[0], config, max_nfev=10000))
+
+    print(f"{len(spectra)} frames, {len(spectra[0].intensity)} pixels per frame")
+    report("rebuild", run(spectra, start, fit_phase_rebuild))
+    report("engine", run(spectra, start, fit_phase_engine(engine)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Function evaluations and wall time per fit with finite-difference vs.
+analytic Jacobian, for the full initial fit and the phase-only tracking fit.
+
+Run from the repository root:
+
+    python -m phase_control.Demo.bench_jacobian [spectrum file] [--frames N]
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from phase_control.Demo.data_io.data_loader import load_spectra
+from phase_control.analysis.config import AnalysisConfig
+from phase_control.analysis.fit_engine import FitEngine
+from phase_control.domain.models import Spectrum
+
+DEFAULT_PATH = Path("Z:\\Droplets\\20251120\\Spectra_GA=26_DA=15p9\\spectrum-20-Nov-2025_121750 - both arms 10ms.txt")
+
+
+def run(engine: FitEngine, spectra: list[Spectrum], config: AnalysisConfig) -> None:
+    t0 = time.perf_counter()
+    result = engine.fit_full(spectra[0], config, max_nfev=10000)
+    full_time = time.perf_counter() - t0
+    print(f"  full fit    nfev {result.nfev:6d}   {full_time * 1e3:8.2f} ms   redchi {result.redchi:.3e}")
+
+    config = AnalysisConfig.from_fit_result(config, result)
+    nfev = np.empty(len(spectra))
+    times = np.empty(len(spectra))
+
+    for i, s in enumerate(spectra):
+        t0 = time.perf_counter()
+        result = engine.fit_phase(s, config)
+        times[i] = time.perf_counter() - t0
+        nfev[i] = result.nfev
+        config = AnalysisConfig.from_fit_result(config, result)
+
+    print(f"  phase fit   nfev {nfev.mean():6.1f}   {np.median(times) * 1e3:8.2f} ms (median of {len(spectra)})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", type=Path, default=DEFAULT_PATH)
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    config = AnalysisConfig()
+    spectra = [s.cut(config.wavelength_range) for s in load_spectra(args.path)][: args.frames]
+
+    print("finite differences")
+    run(FitEngine(analytic_jacobian=False), spectra, config)
+    print("analytic Jacobian")
+    run(FitEngine(analytic_jacobian=True), spectra, config)
+
+
+if __name__ == "__main__":
+    main()
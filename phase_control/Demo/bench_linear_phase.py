@@ -0,0 +1,70 @@
+"""
+Validate the closed-form LinearPhaseEstimator against the lmfit phase-only
+fit on recorded spectra and compare per-frame phase latency.
+
+Run from the repository root:
+
+    python -m phase_control.Demo.bench_linear_phase [spectrum file] [--frames N]
+"""
+import argparse
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+from phase_control.Demo.data_io.data_loader import load_spectra
+from phase_control.analysis.config import AnalysisConfig
+from phase_control.analysis.fit_engine import FitEngine
+from phase_control.analysis.linear_phase import LinearPhaseEstimator
+
+DEFAULT_PATH = Path("Z:\\Droplets\\20251120\\Spectra_GA=26_DA=15p9\\spectrum-20-Nov-2025_121750 - both arms 10ms.txt")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", type=Path, default=DEFAULT_PATH)
+    parser.add_argument("--frames", type=int, default=500)
+    args = parser.parse_args()
+
+    config = AnalysisConfig()
+    spectra = [s.cut(config.wavelength_range) for s in load_spectra(args.path)][: args.frames]
+
+    engine = FitEngine()
+    estimator = LinearPhaseEstimator(engine.model_cache)
+
+    lm_config = AnalysisConfig.from_fit_result(config, engine.fit_full(spectra[0], config, max_nfev=10000))
+    lin_config = lm_config
+
+    n = len(spectra)
+    lm_phase, lin_phase = np.empty(n), np.empty(n)
+    lm_time, lin_time = np.empty(n), np.empty(n)
+
+    for i, s in enumerate(spectra):
+        x = np.asarray(s.wavelengths_nm, dtype=float)
+        y = np.asarray(s.intensity, dtype=float)
+
+        t0 = time.perf_counter()
+        lm_config = AnalysisConfig.from_fit_result(lm_config, engine.fit_phase(s, lm_config))
+        lm_time[i] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        phase = estimator.estimate(x, y, lin_config)
+        lin_time[i] = time.perf_counter() - t0
+        lin_config = AnalysisConfig.from_fit_values(lin_config, {"phase": phase})
+
+        lm_phase[i] = lm_config.phase.Rad
+        lin_phase[i] = phase
+
+    # both estimates are only defined modulo π
+    diff = (lin_phase - lm_phase + 0.5 * math.pi) % math.pi - 0.5 * math.pi
+    diff_deg = np.degrees(diff)
+
+    print(f"{n} frames, {len(spectra[0].intensity)} pixels per frame")
+    print(f"lmfit   median {np.median(lm_time) * 1e3:8.3f} ms    p95 {np.percentile(lm_time, 95) * 1e3:8.3f} ms")
+    print(f"linear  median {np.median(lin_time) * 1e6:8.1f} us    p95 {np.percentile(lin_time, 95) * 1e6:8.1f} us")
+    print(f"phase difference linear - lmfit: mean {diff_deg.mean():+.3f}°, std {diff_deg.std():.3f}°, max |{np.abs(diff_deg).max():.3f}°|")
+
+
+if __name__ == "__main__":
+    main()
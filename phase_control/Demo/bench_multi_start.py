@@ -0,0 +1,65 @@
+"""
+Time-to-first-lock of the single local initial fit vs. the multi-start
+initializer. Every selected frame is treated as the first frame of a run.
+
+Run from the repository root:
+
+    python -m phase_control.Demo.bench_multi_start [spectrum file] [--frames N] [--workers W]
+"""
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+
+from phase_control.Demo.data_io.data_loader import load_spectra
+from phase_control.analysis.config import AnalysisConfig, MultiStartConfig
+from phase_control.analysis.fit_engine import FitEngine
+from phase_control.analysis.multi_start import MultiStartInitializer
+
+DEFAULT_PATH = Path("Z:\\Droplets\\20251120\\Spectra_GA=26_DA=15p9\\spectrum-20-Nov-2025_121750 - both arms 10ms.txt")
+
+
+def report(name: str, times: np.ndarray, chisqr: np.ndarray) -> None:
+    print(
+        f"{name:<12} time median {np.median(times) * 1e3:8.1f} ms   max {times.max() * 1e3:8.1f} ms   "
+        f"chisqr median {np.median(chisqr):.3e}   max {chisqr.max():.3e}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", type=Path, default=DEFAULT_PATH)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    config = AnalysisConfig()
+    spectra = [s.cut(config.wavelength_range) for s in load_spectra(args.path)]
+    spectra = spectra[:: max(1, len(spectra) // args.frames)][: args.frames]
+
+    engine = FitEngine()
+    initializer = MultiStartInitializer(MultiStartConfig(workers=args.workers), engine.func)
+
+    n = len(spectra)
+    single_t, single_c = np.empty(n), np.empty(n)
+    multi_t, multi_c = np.empty(n), np.empty(n)
+
+    for i, s in enumerate(spectra):
+        t0 = time.perf_counter()
+        single_c[i] = engine.fit_full(s, config, max_nfev=10000).chisqr
+        single_t[i] = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        multi_c[i] = initializer.fit(s, config).chisqr
+        multi_t[i] = time.perf_counter() - t0
+
+    initializer.close()
+
+    print(f"{n} start frames")
+    report("single", single_t, single_c)
+    report("multi-start", multi_t, multi_c)
+
+
+if __name__ == "__main__":
+    main()
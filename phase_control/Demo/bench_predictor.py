@@ -0,0 +1,65 @@
+"""
+Phase-only fit iterations and branch jumps with and without the
+alpha-beta phase predictor, replayed on recorded spectra.
+
+--stride k uses every k-th frame, i.e. k times the phase motion between
+fitted frames.
+
+Run from the repository root:
+
+    python -m phase_control.Demo.bench_predictor [spectrum file] [--frames N] [--stride k]
+"""
+import argparse
+import math
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+from phase_control.Demo.data_io.data_loader import load_spectra
+from phase_control.analysis.config import AnalysisConfig
+from phase_control.analysis.phase_tracker import PhaseTracker
+from phase_control.domain.models import Spectrum
+
+DEFAULT_PATH = Path("Z:\\Droplets\\20251120\\Spectra_GA=26_DA=15p9\\spectrum-20-Nov-2025_121750 - both arms 10ms.txt")
+
+
+def replay(spectra: list[Spectrum], config: AnalysisConfig) -> tuple[np.ndarray, int]:
+    """nfev per phase-only fit and number of fits that landed on another π branch."""
+    tracker = PhaseTracker(config)
+    nfev = np.zeros(len(spectra) - 1)
+    phases = np.zeros(len(spectra))
+
+    for i, s in enumerate(spectra):
+        tracker.update(s)
+        assert tracker.current_phase is not None
+        phases[i] = tracker.current_phase.Rad
+        if i > 0:
+            nfev[i - 1] = tracker.last_nfev
+
+    tracker.close()
+
+    if tracker.predictor is not None:
+        # the predictor unwraps the reported phase, so count against its prediction
+        return nfev, tracker.predictor.branch_jumps
+    return nfev, int(np.sum(np.abs(np.diff(phases)) > 0.5 * math.pi))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", nargs="?", type=Path, default=DEFAULT_PATH)
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--stride", type=int, default=1)
+    args = parser.parse_args()
+
+    base = replace(AnalysisConfig(), warm_start=None, drift_refit=None)
+    spectra = [s.cut(base.wavelength_range) for s in load_spectra(args.path)][:: args.stride][: args.frames]
+    print(f"{len(spectra)} frames (stride {args.stride})")
+
+    for name, config in (("last phase", replace(base, phase_prediction=None)), ("predictor", base)):
+        nfev, jumps = replay(spectra, config)
+        print(f"{name:<11} nfev mean {nfev.mean():5.2f}   max {nfev.max():4.0f}   branch jumps {jumps}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Per-frame render cost of the live spectrum plot: full redraw with
+relim/autoscale (the former loop) vs. BlitRenderer, with and without
+min/max decimation to the axes' pixel width (DecimatedLine).
+
+Uses the Agg canvas, so it runs without a display; with a GUI backend
+the blit itself adds the copy to the screen.
+
+Run from the repository root:
+
+    python -m phase_control.Demo.bench_render [--frames N] [--pixels N]
+"""
+import argparse
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+from phase_control.domain.blit_renderer import BlitRenderer
+from phase_control.domain.decimation import DecimatedLine
+
+
+def setup(x: np.ndarray) -> tuple[plt.Figure, plt.Axes, list]:
+    fig, ax = plt.subplots()
+    lines = [ax.plot(x, np.zeros_like(x))[0] for _ in range(3)]
+    ax.set_xlabel("Wavelength [nm]")
+    ax.set_ylabel("Counts")
+    ax.grid(axis="both")
+    fig.tight_layout()
+    return fig, ax, lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--pixels", type=int, default=2048)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    x = np.linspace(790.0, 815.0, args.pixels)
+    frames = [np.sin(0.5 * x + 0.05 * i) ** 2 + 0.05 * rng.standard_normal(x.size) for i in range(args.frames)]
+
+    fig, ax, lines = setup(x)
+    times = np.empty(args.frames)
+    for i, y in enumerate(frames):
+        t0 = time.perf_counter()
+        for line in lines:
+            line.set_ydata(y)
+        ax.relim()
+        ax.autoscale_view()
+        fig.canvas.draw()
+        fig.canvas.flush_events()
+        times[i] = time.perf_counter() - t0
+    plt.close(fig)
+    print(f"full redraw   {1e3 * np.median(times):7.2f} ms median")
+
+    fig, ax, lines = setup(x)
+    renderer = BlitRenderer(fig)
+    for line in lines:
+        renderer.add(line)
+    renderer.draw_full()
+    for i, y in enumerate(frames):
+        t0 = time.perf_counter()
+        for line in lines:
+            line.set_ydata(y)
+        renderer.render()
+        times[i] = time.perf_counter() - t0
+    plt.close(fig)
+    print(f"blit          {1e3 * np.median(times):7.2f} ms median   ({renderer.full_draws} full draws, {renderer.blits} blits)")
+
+    fig, ax, lines = setup(x)
+    renderer = BlitRenderer(fig)
+    for line in lines:
+        renderer.add(line)
+    decimated = [DecimatedLine(line, x) for line in lines]
+    renderer.draw_full()
+    for i, y in enumerate(frames):
+        t0 = time.perf_counter()
+        for line in decimated:
+            line.set_ydata(y)
+        renderer.render()
+        times[i] = time.perf_counter() - t0
+    points = len(decimated[0].line.get_xdata())
+    plt.close(fig)
+    print(f"blit + minmax {1e3 * np.median(times):7.2f} ms median   ({points} of {args.pixels} points per line)")
+
+
+if __name__ == "__main__":
+    main()
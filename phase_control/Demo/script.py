@@ -33,6 +33,7 @@ for s in spectra:
     phase_tracker.update(s)
     
     if phase_tracker.current_phase is not None:
+        phases.append(phase_tracker.current_phase)
         delta = phase_corrector.update(phase_tracker.current_phase)
     else:
         delta = Angle(0)
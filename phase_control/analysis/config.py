@@ -1,14 +1,47 @@
 from dataclasses import dataclass, fields, asdict
+from enum import Enum
+from functools import lru_cache
 import inspect
-from typing import Any, Callable, TypeVar, get_type_hints
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Mapping, Optional, TypeVar, get_type_hints
 
-import lmfit
 import numpy as np
 
 from base_lib.models import Angle, Length, Prefix, Range
 
+if TYPE_CHECKING:
+    # annotations only; lmfit (with scipy) is loaded by the fit engine
+    import lmfit
+
 T = TypeVar("T", bound="FitParameter")
 
+_TO_FLOAT: dict[type[Any], Callable[[Any], float]] = {
+    Length: lambda l: l.value(Prefix.NANO),
+    Angle:  lambda a: a.Rad,
+    float:  float,
+}
+
+_FROM_FLOAT: dict[type[Any], Callable[[float], Any]] = {
+    Length: lambda v: Length(v, Prefix.NANO),
+    Angle:  lambda v: Angle(v),
+    float:  float,
+}
+
+
+@lru_cache(maxsize=None)
+def fit_arg_names(func: Callable[..., Any]) -> tuple[str, ...]:
+    """
+    Argument names of a model function, independent variable first.
+    Cached, so inspect.signature runs once per function.
+    """
+    return tuple(inspect.signature(func).parameters)
+
+
+@lru_cache(maxsize=None)
+def _field_types(cls: type) -> dict[str, type[Any]]:
+    return get_type_hints(cls)
+
+
 @dataclass
 class FitParameter:
     carrier_wavelength: Length = Length(802.38, Prefix.NANO)
@@ -19,52 +52,136 @@ class FitParameter:
     acceleration: float = 0.0979 * np.pi * 2
     
     def to_fit_kwargs(self, func: Callable[..., Any]) -> dict[str, float]:
-        sig = inspect.signature(func)
-        param_names = list(sig.parameters.keys())[1:]  
-
-        type_converters = {
-            Length: lambda l: l.value(Prefix.NANO),
-            Angle:  lambda a: a.Rad,
-            float:  float,
-        }
+        param_names = fit_arg_names(func)[1:]
+        type_hints = _field_types(type(self))
 
         kwargs: dict[str, float] = {}
-        type_hints = get_type_hints(type(self))
 
         for name in param_names:
             val = getattr(self, name)
             field_type = type_hints.get(name, type(val))
-            conv = type_converters.get(field_type, lambda v: v)
+            conv = _TO_FLOAT.get(field_type, lambda v: v)
             kwargs[name] = conv(val)
 
         return kwargs
     
     @classmethod
-    def from_fit_result(cls: type[T], base: T, result: lmfit.model.ModelResult) -> T:
-        best = result.best_values  
-
-        type_converters: dict[type[Any], Callable[[float], Any]] = {
-            Length: lambda v: Length(v, Prefix.NANO),
-            Angle:  lambda v: Angle(v),
-            float:  float,
-        }
+    def from_fit_result(cls: type[T], base: T, result: "lmfit.model.ModelResult") -> T:
+        return cls.from_fit_values(base, result.best_values)
 
-        type_hints: dict[str, type[Any]] = get_type_hints(cls)
+    @classmethod
+    def from_fit_values(cls: type[T], base: T, values: Mapping[str, float]) -> T:
+        """
+        Build a new instance from plain fit values (nm / rad / float).
+        Fields that are not part of 'values' are taken from 'base'.
+        """
+        type_hints = _field_types(cls)
 
         kwargs: dict[str, Any] = {}
 
         for f in fields(cls):
             name = f.name
 
-            if name in best:
+            if name in values:
                 field_type = type_hints.get(name, float)
-                conv = type_converters.get(field_type, lambda v: v)
-                kwargs[name] = conv(best[name])
+                conv = _FROM_FLOAT.get(field_type, lambda v: v)
+                kwargs[name] = conv(values[name])
             else:
                 kwargs[name] = getattr(base, name)
 
         return cls(**kwargs)
 
+class PhaseEstimator(Enum):
+    """How PhaseTracker obtains the phase once the other parameters are fixed."""
+    LMFIT = "lmfit"      # iterative phase-only lmfit fit
+    LINEAR = "linear"    # closed-form linear least squares (LinearPhaseEstimator)
+
+class BinningMode(Enum):
+    """Pre-fit reduction of neighbouring pixels (see AnalysisConfig.binning_factor)."""
+    MEAN = "mean"            # Spectrum.binned
+    DECIMATE = "decimate"    # Spectrum.decimated
+
+@dataclass(frozen=True)
+class MultiStartConfig:
+    """
+    Grid for the multi-start initial fit. The grid is centred on the
+    AnalysisConfig start values; phase covers one full period (π).
+    """
+    phase_steps: int = 12
+    acceleration_span: float = 0.5          # relative, ± fraction of the start value
+    acceleration_steps: int = 7
+    starting_wavelength_span_nm: float = 3.0
+    starting_wavelength_steps: int = 7
+    candidates: int = 4                     # best grid points that are refined
+    max_nfev: int = 2000                    # per refinement
+    workers: int = 1                        # > 1: refine in a thread pool
+
+@dataclass(frozen=True)
+class DriftRefitConfig:
+    """
+    Background full refit when the phase-only residual drifts upwards.
+    The reference level is the running residual over the first
+    'warmup_frames' frames after a full fit.
+    """
+    smoothing: float = 0.05          # EWMA weight of the newest residual
+    warmup_frames: int = 20
+    threshold: float = 1.5           # refit when residual > threshold * reference
+    min_interval_frames: int = 100   # frames between two refits
+    max_nfev: int = 2000
+
+@dataclass(frozen=True)
+class WarmStartConfig:
+    """
+    Persist the last converged fit and reuse it at the next start if it
+    still describes the first frame.
+    """
+    path: Path = Path(__file__).resolve().parents[1] / ".warm_start.json"
+    tolerance: float = 1.5           # accept if residual <= tolerance * saved residual
+
+@dataclass(frozen=True)
+class PredictorConfig:
+    """Alpha-beta filter gains for the predicted phase start value."""
+    alpha: float = 0.6
+    beta: float = 0.1
+
+@dataclass(frozen=True)
+class TrendCorrectorConfig:
+    """
+    Window statistics and PI gains of the trend-based PhaseCorrector.
+    A correction is issued only when the predicted error leaves the
+    tolerance and the window mean differs from zero by more than
+    'significance' standard errors.
+    """
+    window: int = 32                 # frames kept in the ring
+    min_samples: int = 8             # frames needed after a move before correcting
+    significance: float = 3.0        # in standard errors
+    kp: float = 1.0                  # share of the predicted error corrected at once
+    ki: float = 0.05                 # 1/s, on the error integrated since the last move
+    integral_limit_deg: float = 45.0
+    lead: float = 0.15               # s, expected time until the move takes effect
+
+@dataclass(frozen=True)
+class CalibrationConfig:
+    """
+    HWP sweep for the phase-per-HWP-angle calibration (HwpCalibrator).
+    The sweep is centred on the current waveplate angle (moved inward
+    near the ends of the rotator range) and goes up and back down; 'span_deg' / ('steps' - 1) times the gain (≈ 4) must stay
+    well below 90° of phase.
+    """
+    span_deg: float = 10.0
+    steps: int = 11                  # per direction
+    burst: int = 10                  # clean frames fitted per angle
+    frame_timeout: float = 2.0       # s to wait for each frame
+    min_gain: float = 0.5            # |deg phase / deg HWP| below this counts as failed
+    path: Path = Path(__file__).resolve().parents[1] / ".hwp_calibration.json"
+
 @dataclass
 class AnalysisConfig(FitParameter):
     wavelength_range: Range[Length] = Range(Length(800, Prefix.NANO), Length(805, Prefix.NANO))
+    phase_estimator: PhaseEstimator = PhaseEstimator.LMFIT
+    multi_start: Optional[MultiStartConfig] = MultiStartConfig()  # None: single fit from the start values
+    binning_factor: int = 1                                       # pixels per fitted point, 1 = off
+    binning_mode: BinningMode = BinningMode.MEAN
+    drift_refit: Optional[DriftRefitConfig] = DriftRefitConfig()  # None: phase-only forever
+    warm_start: Optional[WarmStartConfig] = WarmStartConfig()     # None: always run the initial fit
+    phase_prediction: Optional[PredictorConfig] = PredictorConfig()  # None: start from the last phase
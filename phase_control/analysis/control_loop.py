@@ -0,0 +1,315 @@
+# phase_control/analysis/control_loop.py
+"""
+Phase tracking and correction on their own thread.
+
+Responsibilities:
+- take every new clean frame from the FrameBuffer (full frame rate)
+- fit the phase, compute and request HWP corrections
+- optionally run the HWP calibration sweep after the first fit
+- publish the latest state as a ControlSnapshot and its fit time to
+  LoopMetrics
+
+This module does NOT:
+- import or call matplotlib; the GUI (run_analysis) or a headless runner
+  reads the SnapshotBuffer at its own pace and drops intermediate states
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from base_lib.models import Angle
+from phase_control.analysis.config import AnalysisConfig, CalibrationConfig
+from phase_control.analysis.hwp_calibration import CalibrationStore, HwpCalibration, HwpCalibrator
+from phase_control.analysis.phase_corrector import PhaseCorrector
+from phase_control.analysis.phase_tracker import PhaseTracker
+from phase_control.correction_io.config import RotatorConfig
+from phase_control.correction_io.elliptec_ell14 import ElliptecRotator, start_rotator
+from phase_control.correction_io.rotator_worker import RotatorWorker
+from phase_control.domain.startup_timeline import StartupTimeline
+from phase_control.stream_io import FrameBuffer, StreamFrame
+
+
+@dataclass(frozen=True)
+class ControlSnapshot:
+    """State after one processed frame. Arrays are not modified afterwards."""
+    index: int                        # processed frames so far, 1-based
+    acquired_at: float                # exposure start, time.monotonic()
+    wavelengths_nm: np.ndarray
+    intensity: np.ndarray
+    model: np.ndarray                 # fit of this frame
+    reference: Optional[np.ndarray]   # model at the target phase, fixed after the first frame
+    phase: Angle
+    correction: Angle                 # HWP correction computed from this frame (0: none)
+    fit_seconds: float                # tracker + corrector time for this frame
+
+
+class SnapshotBuffer:
+    """
+    Thread-safe holder of the latest ControlSnapshot.
+
+    - publish(): called by the control thread for every frame
+    - latest(): newest snapshot or None; readers compare 'index' to skip
+      states they have already shown
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latest: Optional[ControlSnapshot] = None
+
+    def publish(self, snapshot: ControlSnapshot) -> None:
+        with self._lock:
+            self._latest = snapshot
+
+    def latest(self) -> Optional[ControlSnapshot]:
+        with self._lock:
+            return self._latest
+
+
+@dataclass(frozen=True)
+class MetricsReport:
+    """Loop statistics since the previous LoopMetrics.take()."""
+    frames: int
+    seconds: float
+    fps: float
+    fit_ms: tuple[float, float, float]    # p50, p90, p99
+    fit_max_ms: float
+
+
+class LoopMetrics:
+    """
+    Per-frame fit times of the control loop, for periodic reports.
+
+    - record(): called by the control thread for every frame
+    - take(): statistics since the last take(), then start a new period;
+      at most 'capacity' fit times are kept per period
+    """
+
+    def __init__(self, capacity: int = 4096) -> None:
+        self._lock = threading.Lock()
+        self._fit_seconds: deque[float] = deque(maxlen=capacity)
+        self._frames = 0
+        self._since = time.monotonic()
+
+    def record(self, fit_seconds: float) -> None:
+        with self._lock:
+            self._fit_seconds.append(fit_seconds)
+            self._frames += 1
+
+    def take(self) -> MetricsReport:
+        now = time.monotonic()
+        with self._lock:
+            fits = np.asarray(self._fit_seconds, dtype=float)
+            frames, since = self._frames, self._since
+            self._fit_seconds.clear()
+            self._frames = 0
+            self._since = now
+
+        seconds = now - since
+        if fits.size:
+            p50, p90, p99 = (float(v) for v in 1e3 * np.percentile(fits, [50, 90, 99]))
+            fit_max = float(1e3 * fits.max())
+        else:
+            p50 = p90 = p99 = fit_max = float("nan")
+        return MetricsReport(
+            frames=frames,
+            seconds=seconds,
+            fps=frames / seconds if seconds > 0 else 0.0,
+            fit_ms=(p50, p90, p99),
+            fit_max_ms=fit_max,
+        )
+
+
+class ControlLoop:
+    """
+    Owns tracker, corrector and rotator worker and runs them on a
+    'ControlLoopThread'. start() / stop() from the caller's thread;
+    errors in the loop end it and are kept in 'error'.
+
+    'rotator': an already started RotatorWorker (e.g. connecting and
+    homing while the acquisition process starts up); the loop takes it
+    over and closes it. 'timeline': gets the first fit and the first
+    frame that could be corrected (rotator ready) and is printed then.
+    """
+
+    def __init__(
+        self,
+        buffer: FrameBuffer,
+        config: Optional[AnalysisConfig] = None,
+        rotator_config: RotatorConfig = RotatorConfig(),
+        calibrate: bool = False,
+        calibration_settings: CalibrationConfig = CalibrationConfig(),
+        rotator: Optional[RotatorWorker[ElliptecRotator]] = None,
+        timeline: Optional[StartupTimeline] = None,
+    ) -> None:
+        self._buffer = buffer
+        self._config = config if config is not None else AnalysisConfig()
+        self._tracker = PhaseTracker(self._config)
+
+        self._calibrate = calibrate
+        self._calibration_settings = calibration_settings
+        self._calibration_store = CalibrationStore(calibration_settings.path)
+        self._corrector = PhaseCorrector(calibration=self._calibration_store.load())
+        if self._corrector.calibration is not None:
+            print(f"HWP calibration from {self._corrector.calibration.calibrated_at}: "
+                  f"{self._corrector.calibration.phase_per_hwp_deg:.3f} deg phase / deg HWP")
+
+        # all rotator I/O (connect, home, moves) runs on its own thread
+        self._ell = rotator if rotator is not None else start_rotator(rotator_config)
+        self._timeline = timeline
+        self._pending_move: Optional[Future[Angle]] = None
+        self._reference: Optional[np.ndarray] = None
+
+        self.snapshots = SnapshotBuffer()
+        self.metrics = LoopMetrics()
+        self.error: Optional[BaseException] = None
+        self.frames = 0
+        self.corrections = 0
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ControlLoopThread", daemon=True)
+
+    # ------------------------------------------------------------------ #
+    # Properties
+    # ------------------------------------------------------------------ #
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive()
+
+    @property
+    def rotator(self) -> RotatorWorker[ElliptecRotator]:
+        return self._ell
+
+    @property
+    def tracker(self) -> PhaseTracker:
+        return self._tracker
+
+    # ------------------------------------------------------------------ #
+    # Lifecycle
+    # ------------------------------------------------------------------ #
+
+    def start(self) -> None:
+        # frames exposed while the rotator moves never reach the loop
+        self._buffer.set_motion_filter(self._ell.overlaps_motion)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=timeout)
+
+    # ------------------------------------------------------------------ #
+    # Control thread
+    # ------------------------------------------------------------------ #
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.is_set():
+                frame = self._buffer.wait_next(timeout=0.1)
+                if frame is None:
+                    continue
+                self._step(frame)
+        except BaseException as exc:
+            self.error = exc
+            print("Control loop stopped:", repr(exc))
+        finally:
+            self._buffer.set_motion_filter(None)
+            self._ell.close()
+            self._tracker.close()
+
+    def _step(self, frame: StreamFrame) -> None:
+        t0 = time.perf_counter()
+
+        # start of the exposure; corrections from frames older than the last move are dropped
+        acquired_at = frame.acquisition_start if frame.acquisition_start is not None else time.monotonic()
+        spectrum = self._buffer.to_spectrum(frame).cut(self._config.wavelength_range)
+
+        # a finished move shifts the phase: tell the tracker before fitting and restart the corrector's window
+        pending = self._pending_move
+        if pending is not None and pending.done():
+            error = pending.exception()
+            if error is not None:
+                print("Rotation failed:", error)
+            else:
+                self._tracker.expect_phase_shift(self._corrector.expected_phase_change(pending.result()))
+                self._corrector.move_completed()
+            self._pending_move = None
+
+        self._tracker.update(spectrum)
+        if self._tracker.current_phase is None:
+            raise ValueError("Should have a value.")
+
+        if self._reference is None:
+            reference = AnalysisConfig.from_fit_values(self._tracker.config, {"phase": 0.0})
+            self._reference = self._tracker.model(spectrum.wavelengths_nm, reference).copy()
+
+        if self._calibrate:
+            # needs a fitted frame for the batch phase fit; blocks this thread for the sweep
+            self._calibrate = False
+            self._corrector.calibration = self._run_calibration() or self._corrector.calibration
+            self._corrector.move_completed()
+            return
+
+        correction_angle = self._corrector.update(self._tracker.current_phase, timestamp=acquired_at)
+
+        # the rotator layer drops corrections from frames taken during a move and rate-limits the rest
+        if float(correction_angle) != 0.0:
+            move = self._ell.request_rotation(correction_angle, acquired_at=acquired_at)
+            if move is not None:
+                print("Rotating", correction_angle.Deg)
+                self._pending_move = move
+                self.corrections += 1
+
+        self.frames += 1
+        fit_seconds = time.perf_counter() - t0
+        if self._timeline is not None:
+            self._report_startup()
+        self.metrics.record(fit_seconds)
+        self.snapshots.publish(ControlSnapshot(
+            index=self.frames,
+            acquired_at=acquired_at,
+            wavelengths_nm=np.asarray(spectrum.wavelengths_nm, dtype=float),
+            intensity=np.asarray(spectrum.intensity, dtype=float),
+            model=self._tracker.model(spectrum.wavelengths_nm).copy(),
+            reference=self._reference,
+            phase=self._tracker.current_phase,
+            correction=correction_angle,
+            fit_seconds=fit_seconds,
+        ))
+
+    def _report_startup(self) -> None:
+        assert self._timeline is not None
+        if self.frames == 1:
+            self._timeline.mark("first fit")
+        ready = self._ell.ready
+        if not ready.done():
+            return
+        # a rotator that failed to connect or home never makes a frame correctable
+        if ready.exception() is None:
+            self._timeline.mark("first correctable frame")
+        print(self._timeline.report())
+        self._timeline = None
+
+    def _run_calibration(self) -> Optional[HwpCalibration]:
+        """HWP sweep; the new calibration is saved and returned, None if it failed."""
+        settings = self._calibration_settings
+        error = self._ell.ready.exception()   # waits for connect and homing
+        if error is not None:
+            print("HWP calibration skipped, rotator not available:", error)
+            return None
+        print(f"HWP calibration: {settings.steps} angles up and back over {settings.span_deg}°, {settings.burst} frames each ...")
+        try:
+            calibration = HwpCalibrator(settings).run(self._ell, self._buffer, self._tracker)
+        except RuntimeError as exc:
+            print(exc)
+            return None
+
+        print(f"HWP calibration: {calibration.phase_per_hwp_deg:.3f} deg phase / deg HWP, "
+              f"offset {calibration.offset_deg:.1f}°, residual {calibration.residual_deg:.2f}°")
+        self._calibration_store.save(calibration)
+        return calibration
@@ -0,0 +1,117 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from base_lib.functions import usCFG_projection
+from phase_control.analysis.config import AnalysisConfig, DriftRefitConfig
+from phase_control.analysis.fit_engine import FitEngine
+from phase_control.domain.models import Spectrum
+
+
+class DriftRefitter:
+    """
+    Watches the phase-only fit residual and refits all parameters in the
+    background when it drifts.
+
+    - observe(): called once per frame from the tracking thread; keeps an
+      EWMA of the residual and submits a full refit when it exceeds
+      'threshold' times the reference level
+    - poll(): called from the tracking thread; returns the refitted
+      config once the worker is done, otherwise None
+
+    The refit runs on its own FitEngine in a single worker thread, so
+    phase-only tracking never waits for it.
+    """
+
+    def __init__(
+        self,
+        settings: DriftRefitConfig,
+        func: Callable[..., Any] = usCFG_projection,
+    ) -> None:
+        self._settings = settings
+        self._engine = FitEngine(func)  # only used on the worker thread
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="DriftRefit")
+
+        self._future: Optional[Future[AnalysisConfig]] = None
+        self._submitted_phase: float = 0.0
+
+        self._level: Optional[float] = None
+        self._reference: Optional[float] = None
+        self._frames_since_refit: int = 0
+
+        self.refit_count: int = 0
+
+    @property
+    def residual(self) -> Optional[float]:
+        """Running (EWMA) residual of the phase-only fits."""
+        return self._level
+
+    @property
+    def reference(self) -> Optional[float]:
+        return self._reference
+
+    @property
+    def busy(self) -> bool:
+        return self._future is not None
+
+    def observe(self, residual: float, spectrum: Spectrum, config: AnalysisConfig) -> None:
+        s = self._settings
+
+        if self._level is None:
+            self._level = residual
+        else:
+            self._level += s.smoothing * (residual - self._level)
+        self._frames_since_refit += 1
+
+        if self._reference is None:
+            if self._frames_since_refit >= s.warmup_frames:
+                self._reference = self._level
+            return
+
+        if (
+            self._future is None
+            and self._frames_since_refit >= s.min_interval_frames
+            and self._level > s.threshold * self._reference
+        ):
+            print(f"Residual drift ({self._level:.3g} > {s.threshold} x {self._reference:.3g}), refitting in background.")
+            self._submitted_phase = config.phase.Rad
+            self._future = self._pool.submit(self._refit, spectrum, config)
+
+    def poll(self, current: AnalysisConfig) -> Optional[AnalysisConfig]:
+        """
+        Refitted config, or None if no refit has finished.
+
+        The refit belongs to an older frame, so its phase is shifted by the
+        phase tracked since then: the returned phase keeps the refit's
+        offset relative to the phase-only track.
+        """
+        future = self._future
+        if future is None or not future.done():
+            return None
+        self._future = None
+
+        try:
+            refit = future.result()
+        except Exception as exc:
+            # like a success, so a refit that keeps failing waits out the interval
+            print("Background refit failed:", exc)
+            self._restart_tracking()
+            return None
+
+        self._restart_tracking()
+        self.refit_count += 1
+
+        phase = refit.phase.Rad + (current.phase.Rad - self._submitted_phase)
+        return AnalysisConfig.from_fit_values(refit, {"phase": phase})
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _restart_tracking(self) -> None:
+        """New EWMA and reference after a refit attempt, counting frames from zero."""
+        self._level = None
+        self._reference = None
+        self._frames_since_refit = 0
+
+    def _refit(self, spectrum: Spectrum, config: AnalysisConfig) -> AnalysisConfig:
+        result = self._engine.fit_full(spectrum, config, max_nfev=self._settings.max_nfev)
+        return AnalysisConfig.from_fit_result(config, result)
@@ -0,0 +1,192 @@
+from typing import Any, Callable, Collection, Optional
+
+import lmfit
+import numpy as np
+
+from base_lib.functions import usCFG_projection
+from phase_control.analysis.config import AnalysisConfig, fit_arg_names
+from phase_control.analysis.phase_model import PhaseModelCache
+from phase_control.analysis.us_cfg import reproduces, us_cfg_jacobian
+from phase_control.domain.models import Spectrum
+
+
+class FitEngine:
+    """
+    Reusable lmfit setup for the usCFG model.
+
+    The lmfit.Model, its Parameters and the argument names are built once.
+    Between fits only the start values, the 'vary' flags (if the set of
+    free parameters changes) and the data are updated in place.
+
+    Phase-only fits run on a separate one-parameter model that evaluates
+    the cached PhaseModelCache terms instead of the full model function,
+    provided us_cfg reproduces 'func' (checked once, on the first
+    phase-only fit); otherwise they fit 'func' itself with only the phase
+    free.
+
+    With 'analytic_jacobian' the fit uses closed-form derivatives instead
+    of finite differences. For full fits these come from us_cfg, provided
+    us_cfg reproduces 'func' (checked once, on the first fit).
+    """
+
+    def __init__(
+        self,
+        func: Callable[..., Any] = usCFG_projection,
+        analytic_jacobian: bool = True,
+        model_cache: Optional[PhaseModelCache] = None,
+    ) -> None:
+        arg_names = fit_arg_names(func)
+
+        self._func = func
+        self._x_name: str = arg_names[0]
+        self._param_names: tuple[str, ...] = arg_names[1:]
+
+        self._model = lmfit.Model(func, independent_vars=[self._x_name])
+        self._params: lmfit.Parameters = self._model.make_params(
+            **{name: 0.0 for name in self._param_names}
+        )
+        self._vary: Optional[frozenset[str]] = None
+
+        self._analytic_jacobian = analytic_jacobian
+        self._jacobian_ok: Optional[bool] = None
+
+        self._cache = model_cache if model_cache is not None else PhaseModelCache(func)
+        self._cache_ok: Optional[bool] = None
+        self._phase_model = lmfit.Model(self._evaluate_phase, independent_vars=["x"])
+        self._phase_params: lmfit.Parameters = self._phase_model.make_params(phase=0.0)
+
+    @property
+    def func(self) -> Callable[..., Any]:
+        return self._func
+
+    @property
+    def param_names(self) -> tuple[str, ...]:
+        return self._param_names
+
+    @property
+    def model_cache(self) -> PhaseModelCache:
+        return self._cache
+
+    def fit_full(
+        self,
+        spectrum: Spectrum,
+        config: AnalysisConfig,
+        max_nfev: Optional[int] = None,
+    ) -> lmfit.model.ModelResult:
+        """Fit all model parameters, starting from 'config'."""
+        return self.fit(spectrum, config, self._param_names, max_nfev=max_nfev)
+
+    def fit_phase(
+        self,
+        spectrum: Spectrum,
+        config: AnalysisConfig,
+    ) -> lmfit.model.ModelResult:
+        """Fit only the phase; all other parameters are held at 'config'."""
+        x = np.asarray(spectrum.wavelengths_nm, dtype=float)
+        if not self._use_cache(x, config):
+            return self.fit(spectrum, config, ("phase",))
+
+        self._cache.prepare(x, config)
+        self._phase_params["phase"].value = config.phase.Rad
+
+        fit_kws: Optional[dict[str, Any]] = None
+        if self._analytic_jacobian:
+            fit_kws = {"Dfun": self._phase_jacobian, "col_deriv": 1}
+
+        return self._phase_model.fit(
+            np.asarray(spectrum.intensity, dtype=float),
+            params=self._phase_params,
+            fit_kws=fit_kws,
+            x=x,
+        )
+
+    def fit(
+        self,
+        spectrum: Spectrum,
+        config: AnalysisConfig,
+        vary: Collection[str],
+        max_nfev: Optional[int] = None,
+    ) -> lmfit.model.ModelResult:
+        self._load(config, frozenset(vary))
+
+        x = np.asarray(spectrum.wavelengths_nm, dtype=float)
+        x_kwargs: dict[str, Any] = {self._x_name: x}
+
+        fit_kws: Optional[dict[str, Any]] = None
+        if self._use_jacobian(x):
+            fit_kws = {"Dfun": self._residual_jacobian, "col_deriv": 1}
+
+        return self._model.fit(
+            np.asarray(spectrum.intensity, dtype=float),
+            params=self._params,
+            max_nfev=max_nfev,
+            fit_kws=fit_kws,
+            **x_kwargs,
+        )
+
+    def _load(self, config: AnalysisConfig, vary: frozenset[str]) -> None:
+        values = config.to_fit_kwargs(self._func)
+        params = self._params
+
+        for name in self._param_names:
+            params[name].value = values[name]
+
+        if vary != self._vary:
+            for name in self._param_names:
+                params[name].vary = name in vary
+            self._vary = vary
+
+    def _use_jacobian(self, x: np.ndarray) -> bool:
+        if not self._analytic_jacobian:
+            return False
+
+        if self._jacobian_ok is None:
+            values = {name: self._params[name].value for name in self._param_names}
+            self._jacobian_ok = reproduces(self._func, x, values)
+            if not self._jacobian_ok:
+                print("Analytic Jacobian does not match the model function, using finite differences.")
+
+        return self._jacobian_ok
+
+    def _use_cache(self, x: np.ndarray, config: AnalysisConfig) -> bool:
+        if self._cache_ok is None:
+            self._cache_ok = reproduces(self._func, x, config.to_fit_kwargs(self._func))
+            if not self._cache_ok:
+                print("Cached phase model does not match the model function, fitting the phase on the full model.")
+
+        return self._cache_ok
+
+    def _residual_jacobian(
+        self,
+        params: lmfit.Parameters,
+        data: np.ndarray,
+        weights: Optional[np.ndarray],
+        **kwargs: Any,
+    ) -> np.ndarray:
+        """
+        Jacobian of lmfit's residual (data - model) * weights with respect
+        to the varying parameters, one row per parameter (col_deriv=1).
+        """
+        values = {name: params[name].value for name in self._param_names}
+        jac = us_cfg_jacobian(kwargs[self._x_name], **values)
+
+        rows = -np.array([jac[name] for name in self._param_names if params[name].vary])
+        if weights is not None:
+            rows *= weights
+        return rows
+
+    def _evaluate_phase(self, x: np.ndarray, phase: float) -> np.ndarray:
+        # copy: lmfit keeps the returned array (e.g. as best_fit)
+        return self._cache.evaluate(phase).copy()
+
+    def _phase_jacobian(
+        self,
+        params: lmfit.Parameters,
+        data: np.ndarray,
+        weights: Optional[np.ndarray],
+        **kwargs: Any,
+    ) -> np.ndarray:
+        row = -self._cache.derivative(params["phase"].value)
+        if weights is not None:
+            row *= weights
+        return row[np.newaxis, :]
@@ -0,0 +1,238 @@
+"""
+Calibration of the fit phase against the half-wave plate angle.
+
+Responsibilities:
+- step the rotator up and back down over a set of angles around its
+  current position, shifted inward to stay inside the rotator's range
+  (ElliptecRotator wraps moves past ±90° by 90°, which would corrupt
+  the regression)
+- collect a burst of clean (post-move) frames at each angle
+- fit all phases in one batch and regress phase vs. HWP angle
+- persist slope, sign and offset for PhaseCorrector
+
+The regression has a linear drift term as well: with the up-and-down
+sweep, angle and time are uncorrelated, so a drifting phase does not
+bias the slope.
+"""
+import math
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+import numpy as np
+
+from base_lib.models import Angle, AngleUnit
+from phase_control.analysis.config import CalibrationConfig
+from phase_control.analysis.linear_phase import LinearPhaseEstimator
+from phase_control.correction_io.elliptec_ell14 import ANGLE_RANGE
+from phase_control.domain.json_file import atomic_write_json, read_json
+
+if TYPE_CHECKING:
+    from phase_control.analysis.phase_tracker import PhaseTracker
+    from phase_control.correction_io.rotator_worker import RotatorWorker
+    from phase_control.stream_io import FrameBuffer
+
+RANGE_MARGIN_DEG = 1.0   # keep sweep targets this far inside ANGLE_RANGE
+
+
+@dataclass
+class HwpCalibration:
+    """Fit phase = offset_deg + phase_per_hwp_deg * HWP angle (deg, HWP relative to home)."""
+    phase_per_hwp_deg: float
+    offset_deg: float
+    residual_deg: float       # RMS of the regression
+    points: int
+    calibrated_at: str
+
+    @property
+    def sign(self) -> int:
+        return 1 if self.phase_per_hwp_deg >= 0 else -1
+
+    @property
+    def conversion_const(self) -> float:
+        """deg HWP per deg phase, magnitude (cf. phase_corrector.CONVERSION_CONST)."""
+        return 1.0 / abs(self.phase_per_hwp_deg)
+
+
+class CalibrationStore:
+    """
+    JSON file holding the last HWP calibration, written atomically
+    (atomic_write_json).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self) -> Optional[HwpCalibration]:
+        return read_json(self._path, _parse_calibration, "HWP calibration")
+
+    def save(self, calibration: HwpCalibration) -> None:
+        data = {
+            "phase_per_hwp_deg": calibration.phase_per_hwp_deg,
+            "sign": calibration.sign,
+            "conversion_const": calibration.conversion_const,
+            "offset_deg": calibration.offset_deg,
+            "residual_deg": calibration.residual_deg,
+            "points": calibration.points,
+            "calibrated_at": calibration.calibrated_at,
+        }
+        atomic_write_json(self._path, data, "HWP calibration")
+
+
+def _parse_calibration(raw: Any) -> HwpCalibration:
+    return HwpCalibration(
+        phase_per_hwp_deg=float(raw["phase_per_hwp_deg"]),
+        offset_deg=float(raw["offset_deg"]),
+        residual_deg=float(raw["residual_deg"]),
+        points=int(raw["points"]),
+        calibrated_at=str(raw.get("calibrated_at", "")),
+    )
+
+
+class HwpCalibrator:
+    """
+    Runs the sweep on an already running loop: the rotator worker, a frame
+    buffer with its motion filter set and a tracker that has fitted at
+    least one frame (its parameters are used for the batch phase fit).
+
+    Blocks the calling thread for the duration of the sweep.
+    """
+
+    def __init__(self, settings: CalibrationConfig) -> None:
+        self._settings = settings
+
+    def run(self, rotator: "RotatorWorker", buffer: "FrameBuffer", tracker: "PhaseTracker") -> HwpCalibration:
+        start = self._angle(rotator)
+        targets = self.sweep_targets(start)
+
+        angles: list[float] = []
+        times: list[float] = []
+        bursts: list[np.ndarray] = []
+        x: Optional[np.ndarray] = None
+        try:
+            for target in targets:
+                self._move_to(rotator, target)
+                angle = self._angle(rotator)
+                wl, burst, t = self._collect(rotator, buffer, tracker)
+                x = wl
+                angles.append(angle)
+                times.append(t)
+                bursts.append(burst)
+                print(f"  HWP {angle:7.2f}°: {len(burst)} frames")
+        finally:
+            self._move_to(rotator, start)
+
+        assert x is not None
+        return self.regress(np.asarray(angles), np.asarray(times), bursts, x, tracker)
+
+    def sweep_targets(self, start_deg: float) -> np.ndarray:
+        """
+        Up-and-down sweep of 'span_deg' around 'start_deg', its centre
+        moved inward as far as needed to keep every target inside
+        ANGLE_RANGE (less RANGE_MARGIN_DEG).
+        """
+        s = self._settings
+        half = 0.5 * s.span_deg
+        low = ANGLE_RANGE.min.Deg + RANGE_MARGIN_DEG + half
+        high = ANGLE_RANGE.max.Deg - RANGE_MARGIN_DEG - half
+        if low > high:
+            raise ValueError(f"HWP calibration span {s.span_deg}° does not fit the rotator range.")
+
+        centre = min(max(start_deg, low), high)
+        up = np.linspace(-half, half, s.steps)
+        return centre + np.concatenate([up, up[-2::-1]])
+
+    def regress(
+        self,
+        angles_deg: np.ndarray,
+        times: np.ndarray,
+        bursts: list[np.ndarray],
+        wavelengths_nm: np.ndarray,
+        tracker: "PhaseTracker",
+    ) -> HwpCalibration:
+        """
+        Batch phase fit of all bursts, then a least-squares fit of the
+        per-angle phases: phase = offset + slope·angle + drift·(t - mean t).
+        """
+        estimator = LinearPhaseEstimator()
+        all_frames = np.concatenate(bursts, axis=0)
+        phases = estimator.estimate_batch(wavelengths_nm, all_frames, tracker.config)
+
+        # per angle: π-periodic circular mean of the burst
+        per_angle = []
+        i = 0
+        for burst in bursts:
+            p = phases[i : i + len(burst)]
+            i += len(burst)
+            per_angle.append(0.5 * np.angle(np.mean(np.exp(2j * p))))
+
+        # unwrap along the sweep (π-periodic) and fit
+        phase_deg = np.degrees(0.5 * np.unwrap(2.0 * np.asarray(per_angle)))
+        design = np.stack([np.ones_like(angles_deg), angles_deg, times - times.mean()], axis=1)
+        (offset, slope, drift), *_ = np.linalg.lstsq(design, phase_deg, rcond=None)
+        residual = phase_deg - design @ np.array([offset, slope, drift])
+
+        calibration = HwpCalibration(
+            phase_per_hwp_deg=float(slope),
+            offset_deg=float(offset),
+            residual_deg=float(np.sqrt(np.mean(residual * residual))),
+            points=len(angles_deg),
+            calibrated_at=datetime.now().isoformat(),
+        )
+        if not abs(calibration.phase_per_hwp_deg) >= self._settings.min_gain:
+            raise RuntimeError(
+                f"HWP calibration failed: gain {calibration.phase_per_hwp_deg:.3g} deg/deg "
+                f"below {self._settings.min_gain} (residual {calibration.residual_deg:.2f}°)."
+            )
+        return calibration
+
+    # ------------------------------------------------------------------ #
+    # internal helpers
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _angle(rotator: "RotatorWorker") -> float:
+        return rotator.submit(lambda r: r.angle.Deg).result()  # type: ignore[attr-defined]
+
+    def _move_to(self, rotator: "RotatorWorker", target_deg: float) -> None:
+        delta = target_deg - self._angle(rotator)
+        if abs(delta) > 1e-9:
+            rotator.rotate(Angle(delta, AngleUnit.DEG)).result()
+
+    def _collect(
+        self,
+        rotator: "RotatorWorker",
+        buffer: "FrameBuffer",
+        tracker: "PhaseTracker",
+    ) -> tuple[np.ndarray, np.ndarray, float]:
+        """
+        'burst' frames exposed after the last move, as
+        (wavelengths, intensities (burst, N), mean exposure start).
+        """
+        s = self._settings
+        intervals = rotator.motion_intervals
+        settled = intervals[-1][1] if intervals else -math.inf
+
+        wavelengths: Optional[np.ndarray] = None
+        rows: list[np.ndarray] = []
+        starts: list[float] = []
+        while len(rows) < s.burst:
+            frame = buffer.wait_next(timeout=s.frame_timeout)
+            if frame is None:
+                raise RuntimeError("HWP calibration: no frames from the spectrometer.")
+            if frame.acquisition_start is not None and frame.acquisition_start < settled:
+                continue
+            starts.append(frame.acquisition_start if frame.acquisition_start is not None else time.monotonic())
+
+            spectrum = tracker.reduce(buffer.to_spectrum(frame).cut(tracker.config.wavelength_range))
+            wavelengths = np.asarray(spectrum.wavelengths_nm, dtype=float)
+            rows.append(np.asarray(spectrum.intensity, dtype=float))
+
+        assert wavelengths is not None
+        return wavelengths, np.stack(rows), float(np.mean(starts))
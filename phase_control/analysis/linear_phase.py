@@ -0,0 +1,93 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+from phase_control.analysis.config import AnalysisConfig
+from phase_control.analysis.phase_model import PhaseModelCache
+
+
+class LinearPhaseEstimator:
+    """
+    Closed-form phase estimate for the usCFG model with all but 'phase' fixed.
+
+    PhaseModelCache writes the model as
+        S = offset(λ) + cos2φ * u(λ) + sin2φ * v(λ)
+    which is linear in cos2φ and sin2φ. Each frame is then a 2-parameter
+    weighted linear least-squares solve followed by atan2. The projection
+    matrix is rebuilt only when the cache (or the weights) change.
+    """
+
+    def __init__(self, cache: Optional[PhaseModelCache] = None) -> None:
+        self._cache = cache if cache is not None else PhaseModelCache()
+
+        self._weights: Optional[np.ndarray] = None
+        self._projector: Optional[np.ndarray] = None
+        self._cache_version: int = -1
+
+    def estimate(
+        self,
+        wavelengths_nm: np.ndarray,
+        intensity: np.ndarray,
+        config: AnalysisConfig,
+    ) -> float:
+        """
+        Phase in rad, on the branch (mod π) closest to config.phase.
+        """
+        self.prepare(wavelengths_nm, config)
+        assert self._projector is not None
+
+        r = np.asarray(intensity, dtype=float) - self._cache.offset
+        p, q = self._projector @ r
+        phase = 0.5 * math.atan2(q, p)
+
+        previous = config.phase.Rad
+        return previous + (phase - previous + 0.5 * math.pi) % math.pi - 0.5 * math.pi
+
+    def estimate_batch(
+        self,
+        wavelengths_nm: np.ndarray,
+        intensities: np.ndarray,
+        config: AnalysisConfig,
+    ) -> np.ndarray:
+        """
+        Phases (rad) of several spectra on one axis, shape (M, N) → (M,),
+        each on the branch (mod π) closest to config.phase. One projection
+        for all frames.
+        """
+        self.prepare(wavelengths_nm, config)
+        assert self._projector is not None
+
+        r = np.asarray(intensities, dtype=float) - self._cache.offset
+        p, q = self._projector @ r.T                          # (2, M)
+        phase = 0.5 * np.arctan2(q, p)
+
+        previous = config.phase.Rad
+        return previous + (phase - previous + 0.5 * math.pi) % math.pi - 0.5 * math.pi
+
+    def prepare(
+        self,
+        wavelengths_nm: np.ndarray,
+        config: AnalysisConfig,
+        weights: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        (Re)build the projection if the model terms changed.
+        Passing 'weights' replaces the current weights and always rebuilds.
+        """
+        cache = self._cache
+        cache.prepare(wavelengths_nm, config)
+
+        if weights is not None:
+            self._weights = np.asarray(weights, dtype=float)
+        elif self._projector is not None and self._cache_version == cache.version:
+            return
+
+        basis = np.stack([cache.u, cache.v])                  # (2, N)
+        w = self._weights
+        if w is None or w.shape != cache.offset.shape:
+            w = np.ones_like(cache.offset)
+        normal = (basis * w) @ basis.T                        # (2, 2)
+
+        self._projector = np.linalg.solve(normal, basis * w)
+        self._cache_version = cache.version
@@ -0,0 +1,137 @@
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+import lmfit
+import numpy as np
+
+from base_lib.functions import usCFG_projection
+from phase_control.analysis.config import AnalysisConfig, MultiStartConfig
+from phase_control.analysis.fit_engine import FitEngine
+from phase_control.analysis.us_cfg import reproduces, us_cfg_model
+from phase_control.domain.models import Spectrum
+
+
+class MultiStartInitializer:
+    """
+    Initial full fit from several start points.
+
+    - evaluates the closed-form model on a phase × acceleration ×
+      starting_wavelength grid in one broadcast NumPy pass (point by
+      point with 'func' if us_cfg does not reproduce it, checked once)
+    - refines the best few grid points with a capped full fit
+    - returns the refinement with the lowest chi-square
+    """
+
+    def __init__(
+        self,
+        settings: MultiStartConfig,
+        func: Callable[..., Any] = usCFG_projection,
+    ) -> None:
+        self._settings = settings
+        self._func = func
+        self._local = threading.local()
+        self._broadcast_ok: Optional[bool] = None
+
+        self._pool: Optional[ThreadPoolExecutor] = None
+        if settings.workers > 1:
+            self._pool = ThreadPoolExecutor(
+                max_workers=settings.workers,
+                thread_name_prefix="MultiStartFit",
+            )
+
+    def fit(self, spectrum: Spectrum, config: AnalysisConfig) -> lmfit.model.ModelResult:
+        candidates = self.candidates(spectrum, config)
+
+        def refine(start: AnalysisConfig) -> lmfit.model.ModelResult:
+            return self._engine().fit_full(spectrum, start, max_nfev=self._settings.max_nfev)
+
+        if self._pool is None:
+            results = [refine(c) for c in candidates]
+        else:
+            results = list(self._pool.map(refine, candidates))
+
+        return min(results, key=lambda r: r.chisqr)
+
+    def candidates(self, spectrum: Spectrum, config: AnalysisConfig) -> list[AnalysisConfig]:
+        """
+        Start configs of the best grid points, best first.
+        """
+        s = self._settings
+        values = config.to_fit_kwargs(self._func)
+
+        x = np.asarray(spectrum.wavelengths_nm, dtype=float)
+        y = np.asarray(spectrum.intensity, dtype=float)
+
+        phase = values["phase"] + np.linspace(0.0, math.pi, s.phase_steps, endpoint=False)
+        acceleration = values["acceleration"] * (
+            1.0 + np.linspace(-s.acceleration_span, s.acceleration_span, s.acceleration_steps)
+        )
+        starting = values["starting_wavelength"] + np.linspace(
+            -s.starting_wavelength_span_nm, s.starting_wavelength_span_nm, s.starting_wavelength_steps
+        )
+
+        cost = self._grid_cost(x, y, values, phase, acceleration, starting)
+
+        n = min(s.candidates, cost.size)
+        best = np.argpartition(cost, n - 1, axis=None)[:n]
+        best = best[np.argsort(cost.ravel()[best])]
+
+        starts: list[AnalysisConfig] = []
+        for i, j, k in zip(*np.unravel_index(best, cost.shape)):
+            starts.append(AnalysisConfig.from_fit_values(config, {
+                "phase": phase[i],
+                "acceleration": acceleration[j],
+                "starting_wavelength": starting[k],
+            }))
+        return starts
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def _grid_cost(
+        self,
+        x: np.ndarray,
+        y: np.ndarray,
+        values: dict[str, float],
+        phase: np.ndarray,
+        acceleration: np.ndarray,
+        starting: np.ndarray,
+    ) -> np.ndarray:
+        """Sum of squared residuals, axes (phase, acceleration, starting_wavelength)."""
+        if self._broadcast_ok is None:
+            self._broadcast_ok = reproduces(self._func, x, values)
+            if not self._broadcast_ok:
+                print("Closed-form model does not match the model function, evaluating the start grid point by point.")
+
+        if self._broadcast_ok:
+            # grid axes: (phase, acceleration, starting_wavelength, x)
+            grid = us_cfg_model(
+                x,
+                carrier_wavelength=values["carrier_wavelength"],
+                starting_wavelength=starting[None, None, :, None],
+                bandwidth=values["bandwidth"],
+                baseline=values["baseline"],
+                phase=phase[:, None, None, None],
+                acceleration=acceleration[None, :, None, None],
+            )
+            return np.sum((grid - y) ** 2, axis=-1)
+
+        cost = np.empty((len(phase), len(acceleration), len(starting)))
+        for i, p in enumerate(phase):
+            for j, a in enumerate(acceleration):
+                for k, s in enumerate(starting):
+                    kwargs = {**values, "phase": p, "acceleration": a, "starting_wavelength": s}
+                    cost[i, j, k] = np.sum((np.asarray(self._func(x, **kwargs), dtype=float) - y) ** 2)
+        return cost
+
+    def _engine(self) -> FitEngine:
+        # FitEngine updates its Parameters in place, so one per thread
+        engine = getattr(self._local, "engine", None)
+        if engine is None:
+            engine = FitEngine(self._func)
+            self._local.engine = engine
+        return engine
@@ -1,43 +1,226 @@
 from dataclasses import dataclass, field
 import math
+import time
 from typing import Optional
 
 import numpy as np
 
 from base_lib.models import Angle, AngleUnit, Prefix
+from phase_control.analysis.config import TrendCorrectorConfig
+from phase_control.analysis.hwp_calibration import HwpCalibration
 
 STARTING_PHASE = Angle(0, AngleUnit.DEG)
 PHASE_TOLERANCE = Angle(10, AngleUnit.DEG)
 
 # grober Startwert: 1° HWP ändert die Fit-Phase um ca. 4°
 # → HWP_deg = - phase_deg / 4
+# Nur ohne Kalibrierung verwendet (PhaseCorrector.calibration, siehe hwp_calibration.py).
 CONVERSION_CONST = 1.0 / 4.0      # deg_HWP pro deg_Phase
-CORRECTION_SIGN = -1      
+CORRECTION_SIGN = -1
 
-from dataclasses import dataclass
 
 @dataclass
 class PhaseCorrector:
+    """
+    Phasenfehler → HWP-Korrektur.
+
+    trend=None: Schwellwert auf die Phase des einzelnen Frames (altes
+    Verhalten). Sonst: Ring der letzten 'window' Fehler (auf π gewickelt)
+    mit Zeitstempeln; korrigiert wird nur bei signifikantem Trend, PI-artig
+    auf den für 'lead' Sekunden vorhergesagten Fehler (siehe _trend_error).
+
+    Nach jeder ausgeführten Drehung move_completed() aufrufen: die Fehler
+    aus der Zeit vor der Drehung gehören nicht mehr zur aktuellen Lage.
+
+    calibration: gemessene Steigung Phase/HWP-Winkel; ersetzt
+    CORRECTION_SIGN und CONVERSION_CONST.
+    """
     _correction_angle: Angle = Angle(0, AngleUnit.DEG)
+    trend: Optional[TrendCorrectorConfig] = TrendCorrectorConfig()
+    calibration: Optional[HwpCalibration] = None
 
-    def update(self, phase: Angle) -> Angle:
+    # Ring (rad / monotonic s) und laufende Summen für die Kreisstatistik
+    _errors: np.ndarray = field(init=False, repr=False)
+    _times: np.ndarray = field(init=False, repr=False)
+    _count: int = field(init=False, default=0)
+    _head: int = field(init=False, default=0)
+    _cos_sum: float = field(init=False, default=0.0)
+    _sin_sum: float = field(init=False, default=0.0)
+    _integral: float = field(init=False, default=0.0)      # rad·s seit der letzten Drehung
+    _last_time: Optional[float] = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        size = self.trend.window if self.trend is not None else 1
+        self._errors = np.zeros(size)
+        self._times = np.zeros(size)
+
+    def update(self, phase: Angle, timestamp: Optional[float] = None) -> Angle:
         """
         phase: gefittete Phase des sin²-Terms als Angle.
         Angle selbst ist 2π-periodisch, deshalb wickeln wir hier explizit auf π.
+        timestamp: Aufnahmezeit des Frames (time.monotonic), sonst jetzt.
         """
         phase_wrapped = self._wrap_phase_pi(phase)
 
         phase_error = Angle(phase_wrapped - STARTING_PHASE)
 
-        if np.abs(phase_error) > PHASE_TOLERANCE:
-            correction_phase = phase_error
-            print("Correction needed!", correction_phase.Deg)
+        if self.trend is None:
+            correction_phase = self._threshold_error(phase_error)
         else:
-            correction_phase = Angle(0)
+            now = time.monotonic() if timestamp is None else timestamp
+            self._push(self._wrap_phase_pi(phase_error).Rad, now)
+            correction_phase = self._trend_error(now)
+
+        if float(correction_phase) != 0.0:
+            print("Correction needed!", correction_phase.Deg)
 
         self._correction_angle = self._convert_phase_to_hwp(correction_phase)
         return self._correction_angle
 
+    def move_completed(self) -> None:
+        """Drehung ausgeführt: Fenster und Integral neu beginnen."""
+        self._count = 0
+        self._head = 0
+        self._cos_sum = 0.0
+        self._sin_sum = 0.0
+        self._integral = 0.0
+        self._last_time = None
+
+    # ------------------------------------------------------------------ #
+    # Statistik über das Fenster
+    # ------------------------------------------------------------------ #
+
+    @property
+    def samples(self) -> int:
+        return self._count
+
+    def circular_mean(self) -> Optional[Angle]:
+        """Kreismittel der π-periodischen Fehler (über 2·Fehler)."""
+        if self._count == 0:
+            return None
+        return Angle(0.5 * math.atan2(self._sin_sum, self._cos_sum), AngleUnit.RAD)
+
+    def circular_std(self) -> Optional[Angle]:
+        """Kreisstandardabweichung der π-periodischen Fehler."""
+        if self._count == 0:
+            return None
+        r = math.hypot(self._cos_sum, self._sin_sum) / self._count
+        return Angle(0.5 * math.sqrt(-2.0 * math.log(min(max(r, 1e-12), 1.0))), AngleUnit.RAD)
+
+    def robust_mean(self) -> Optional[Angle]:
+        """Median der Fehler, relativ zum Kreismittel ausgewickelt."""
+        unwrapped = self._unwrapped()
+        if unwrapped is None:
+            return None
+        return Angle(float(np.median(unwrapped[0])), AngleUnit.RAD)
+
+    def slope(self) -> Optional[float]:
+        """Fehlertrend in rad/s (kleinste Quadrate), None bei < 2 Frames."""
+        unwrapped = self._unwrapped()
+        if unwrapped is None or self._count < 2:
+            return None
+        errors, times = unwrapped
+        t = times - times.mean()
+        denom = float(np.dot(t, t))
+        if denom <= 0.0:
+            return None
+        return float(np.dot(t, errors - errors.mean())) / denom
+
+    # ------------------------------------------------------------------ #
+    # internal helpers
+    # ------------------------------------------------------------------ #
+
+    @staticmethod
+    def _threshold_error(phase_error: Angle) -> Angle:
+        if np.abs(phase_error) > PHASE_TOLERANCE:
+            return phase_error
+        return Angle(0)
+
+    def _push(self, error: float, t: float) -> None:
+        size = len(self._errors)
+        if self._count == size:
+            old = self._errors[self._head]
+            self._cos_sum -= math.cos(2.0 * old)
+            self._sin_sum -= math.sin(2.0 * old)
+        else:
+            self._count += 1
+
+        self._errors[self._head] = error
+        self._times[self._head] = t
+        self._cos_sum += math.cos(2.0 * error)
+        self._sin_sum += math.sin(2.0 * error)
+        self._head = (self._head + 1) % size
+
+        if self._head == 0:
+            # einmal pro Umlauf exakt neu summieren, damit sich keine Rundungsfehler ansammeln
+            self._cos_sum = float(np.cos(2.0 * self._errors[: self._count]).sum())
+            self._sin_sum = float(np.sin(2.0 * self._errors[: self._count]).sum())
+
+    def _unwrapped(self) -> Optional[tuple[np.ndarray, np.ndarray]]:
+        """Fehler und Zeiten im Fenster, Fehler um das Kreismittel ausgewickelt."""
+        center = self.circular_mean()
+        if center is None:
+            return None
+        n = self._count
+        errors = self._errors[:n]
+        d = (errors - center.Rad + 0.5 * math.pi) % math.pi - 0.5 * math.pi
+        return center.Rad + d, self._times[:n]
+
+    def _trend_error(self, now: float) -> Angle:
+        """
+        PI-Stellgröße auf den Fehler in 'lead' Sekunden:
+
+            e_pred = Median + Steigung·(now + lead − mittlere Zeit)
+            u      = kp·e_pred + ki·∫e dt
+
+        Ausgegeben wird u nur, wenn |u| > PHASE_TOLERANCE und der Mittelwert
+        signifikant (> significance Standardfehler) von 0 abweicht. Die
+        Steigung zählt nur, wenn sie selbst signifikant ist.
+        """
+        s = self.trend
+        assert s is not None
+
+        unwrapped = self._unwrapped()
+        if unwrapped is None:
+            return Angle(0)
+        errors, times = unwrapped
+        median = float(np.median(errors))
+
+        # Integral des (robusten) Fehlers seit der letzten Drehung
+        if self._last_time is not None:
+            dt = min(max(now - self._last_time, 0.0), 1.0)
+            limit = math.radians(s.integral_limit_deg) / max(s.ki, 1e-12)
+            self._integral = min(max(self._integral + median * dt, -limit), limit)
+        self._last_time = now
+
+        n = self._count
+        if n < s.min_samples:
+            return Angle(0)
+
+        residuals = errors - errors.mean()
+        spread = float(np.sqrt(np.dot(residuals, residuals) / (n - 1)))
+        if abs(median) <= s.significance * spread / math.sqrt(n):
+            return Angle(0)
+
+        t = times - times.mean()
+        denom = float(np.dot(t, t))
+        slope = 0.0
+        if denom > 0.0:
+            slope = float(np.dot(t, residuals)) / denom
+            fit_residuals = residuals - slope * t
+            slope_error = math.sqrt(float(np.dot(fit_residuals, fit_residuals)) / max(n - 2, 1) / denom)
+            if abs(slope) <= s.significance * slope_error:
+                slope = 0.0
+
+        predicted = median + slope * (now + s.lead - float(times.mean()))
+        u = s.kp * predicted + s.ki * self._integral
+
+        # u und u ± π sind gleichwertig: den kürzeren Weg nehmen
+        u = self._wrap_phase_pi(Angle(u, AngleUnit.RAD)).Rad
+        if abs(u) <= PHASE_TOLERANCE.Rad:
+            return Angle(0)
+        return Angle(u, AngleUnit.RAD)
+
     @staticmethod
     def _wrap_phase_pi(phase: Angle) -> Angle:
         """
@@ -49,14 +232,29 @@ class PhaseCorrector:
         wrapped = (rad + 0.5 * pi) % pi - 0.5 * pi
         return Angle(wrapped, AngleUnit.RAD)
 
-    @staticmethod
-    def _convert_phase_to_hwp(phase: Angle) -> Angle:
+    def _hwp_per_phase(self) -> float:
+        """Korrektur in deg HWP pro deg Phasenfehler, mit Vorzeichen."""
+        if self.calibration is not None:
+            return -1.0 / self.calibration.phase_per_hwp_deg
+        return CORRECTION_SIGN * CONVERSION_CONST
+
+    def _convert_phase_to_hwp(self, phase: Angle) -> Angle:
         """
         Phasefehler (sin²-Phase) → HWP-Winkel.
 
-        Näherung: Δphase ≈ 4 * Δalpha_HWP
+        Ohne Kalibrierung: Δphase ≈ 4 * Δalpha_HWP
         → Δalpha_HWP = - Δphase / 4
         """
         phase_deg = phase.Deg
-        hwp_deg = CORRECTION_SIGN * phase_deg * CONVERSION_CONST
+        hwp_deg = phase_deg * self._hwp_per_phase()
         return Angle(hwp_deg, AngleUnit.DEG)
+
+    def expected_phase_change(self, hwp: Angle) -> Angle:
+        """
+        HWP-Winkel → erwartete Änderung der Fit-Phase.
+
+        Umkehrung von _convert_phase_to_hwp: eine Drehung um
+        _convert_phase_to_hwp(Δphase) verschiebt die Phase um -Δphase.
+        """
+        phase_deg = -hwp.Deg / self._hwp_per_phase()
+        return Angle(phase_deg, AngleUnit.DEG)
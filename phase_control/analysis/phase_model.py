@@ -0,0 +1,115 @@
+import math
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from base_lib.functions import usCFG_projection
+from phase_control.analysis.config import AnalysisConfig, fit_arg_names
+
+
+class PhaseModelCache:
+    """
+    Cached evaluation of the usCFG model when only 'phase' changes.
+
+    With sin²θ = (1 - cos 2θ) / 2 the model
+        S = b + (1-b) * G(λ) * sin²(φ + χ(λ))
+    becomes
+        S = offset(λ) + cos2φ * u(λ) + sin2φ * v(λ)
+    with offset = b + (1-b)G/2, u = -(1-b)/2 * G cos2χ, v = (1-b)/2 * G sin2χ.
+
+    offset, u and v are taken from the model function itself (baseline 0,
+    phases 0, π/2, ±π/4) and cached per frozen parameters and wavelength
+    axis. A phase-only evaluation is then two scaled adds into a
+    preallocated buffer. prepare() rebuilds automatically whenever the
+    frozen parameters or the axis change; invalidate() forces it.
+    """
+
+    def __init__(self, func: Callable[..., Any] = usCFG_projection) -> None:
+        self._func = func
+        self._x_name: str = fit_arg_names(func)[0]
+
+        self._key: Optional[tuple[float, ...]] = None
+        self._x: Optional[np.ndarray] = None
+        self._offset = np.empty(0)
+        self._u = np.empty(0)
+        self._v = np.empty(0)
+        self._buffer = np.empty(0)
+        self._scratch = np.empty(0)
+        self.version: int = 0          # incremented on every rebuild
+
+    @property
+    def func(self) -> Callable[..., Any]:
+        return self._func
+
+    @property
+    def offset(self) -> np.ndarray:
+        return self._offset
+
+    @property
+    def u(self) -> np.ndarray:
+        return self._u
+
+    @property
+    def v(self) -> np.ndarray:
+        return self._v
+
+    def prepare(self, wavelengths_nm: Any, config: AnalysisConfig) -> bool:
+        """
+        Make the cache valid for this axis and the frozen parameters of
+        'config'. Returns True if the terms had to be rebuilt.
+        """
+        kwargs = config.to_fit_kwargs(self._func)
+        kwargs.pop("phase")
+        key = tuple(kwargs.values())
+
+        if key == self._key and self._x is not None and self._same_axis(wavelengths_nm):
+            return False
+
+        x = np.array(wavelengths_nm, dtype=float)
+        baseline = kwargs["baseline"]
+        kwargs["baseline"] = 0.0
+        kwargs[self._x_name] = x
+
+        def g(phase: float) -> np.ndarray:
+            return np.asarray(self._func(phase=phase, **kwargs), dtype=float)
+
+        g0, g90 = g(0.0), g(0.5 * math.pi)
+        half_amp = 0.5 * (1.0 - baseline)
+
+        self._offset = baseline + half_amp * (g0 + g90)
+        self._u = half_amp * (g0 - g90)
+        self._v = half_amp * (g(0.25 * math.pi) - g(-0.25 * math.pi))
+        self._buffer = np.empty_like(x)
+        self._scratch = np.empty_like(x)
+        self._x = x
+        self._key = key
+        self.version += 1
+        return True
+
+    def invalidate(self) -> None:
+        self._key = None
+        self._x = None
+
+    def evaluate(self, phase: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Model at 'phase' (rad). Without 'out' the result is written to an
+        internal buffer that is overwritten by the next call.
+        """
+        if out is None:
+            out = self._buffer
+        np.multiply(self._u, math.cos(2.0 * phase), out=out)
+        np.multiply(self._v, math.sin(2.0 * phase), out=self._scratch)
+        out += self._scratch
+        out += self._offset
+        return out
+
+    def derivative(self, phase: float) -> np.ndarray:
+        """∂S/∂φ at 'phase' (rad)."""
+        return 2.0 * (math.cos(2.0 * phase) * self._v - math.sin(2.0 * phase) * self._u)
+
+    def _same_axis(self, wavelengths_nm: Any) -> bool:
+        x = self._x
+        assert x is not None
+        if len(wavelengths_nm) != x.size:
+            return False
+        return np.array_equal(np.asarray(wavelengths_nm, dtype=float), x)
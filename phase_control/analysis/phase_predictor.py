@@ -0,0 +1,77 @@
+import math
+from typing import Optional
+
+from phase_control.analysis.config import PredictorConfig
+
+
+class PhasePredictor:
+    """
+    Alpha-beta filter on the unwrapped fit phase (rad, per frame).
+
+    - predict(): phase expected for the next frame, including any
+      commanded but not yet observed phase shift
+    - command(): register the phase shift expected from a HWP move
+    - update(): fold in a measured phase; the measurement is moved by
+      multiples of π (the sin² model is π-periodic) to the branch closest
+      to the prediction
+
+    A measurement that lands more than π/2 away from the prediction is
+    counted as a branch jump.
+    """
+
+    def __init__(self, settings: PredictorConfig) -> None:
+        self._settings = settings
+
+        self._phase: Optional[float] = None
+        self._rate: float = 0.0
+        self._pending: float = 0.0
+
+        self.updates: int = 0
+        self.branch_jumps: int = 0
+
+    @property
+    def rate(self) -> float:
+        """Estimated phase drift in rad per frame."""
+        return self._rate
+
+    def reset(self, phase: Optional[float] = None) -> None:
+        self._phase = phase
+        self._rate = 0.0
+        self._pending = 0.0
+
+    def rebase(self, phase: float) -> None:
+        """Move the phase estimate (e.g. after a refit) but keep the drift rate."""
+        self._phase = phase
+        self._pending = 0.0
+
+    def predict(self) -> Optional[float]:
+        if self._phase is None:
+            return None
+        return self._phase + self._rate + self._pending
+
+    def command(self, phase_shift: float) -> None:
+        """Expected phase change (rad) of a commanded HWP move."""
+        self._pending += phase_shift
+
+    def update(self, measured: float) -> float:
+        """
+        Fold in a measured phase; returns it unwrapped onto the predicted branch.
+        """
+        predicted = self.predict()
+        self.updates += 1
+
+        if predicted is None:
+            self._phase = measured
+            return measured
+
+        residual = measured - predicted
+        if abs(residual) > 0.5 * math.pi:
+            self.branch_jumps += 1
+        residual = (residual + 0.5 * math.pi) % math.pi - 0.5 * math.pi
+        unwrapped = predicted + residual
+
+        s = self._settings
+        self._phase = predicted + s.alpha * residual
+        self._rate += s.beta * residual
+        self._pending = 0.0
+        return unwrapped
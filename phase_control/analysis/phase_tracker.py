@@ -1,64 +1,194 @@
-import inspect
-from typing import Any
-import lmfit
 import numpy as np
-from base_lib.models import Angle, Prefix
-from phase_control.analysis.config import AnalysisConfig
+
+from base_lib.models import Angle
+from phase_control.analysis.config import AnalysisConfig, BinningMode, PhaseEstimator
+from phase_control.analysis.drift_refit import DriftRefitter
+from phase_control.analysis.fit_engine import FitEngine
+from phase_control.analysis.linear_phase import LinearPhaseEstimator
+from phase_control.analysis.multi_start import MultiStartInitializer
+from phase_control.analysis.phase_model import PhaseModelCache
+from phase_control.analysis.phase_predictor import PhasePredictor
+from phase_control.analysis.warm_start import WarmStartStore, axis_hash
 from phase_control.domain.models import Spectrum
-from base_lib.functions import usCFG_projection
 
 
 
 class PhaseTracker():
     current_phase: Angle | None = None
-    
+
     def __init__(self, start_config: AnalysisConfig) -> None:
         self._config = start_config
-    
+        self._engine = FitEngine()
+        self._linear = LinearPhaseEstimator(self._engine.model_cache)
+        # separate cache for model(): plotting uses the full axis, fits may be binned
+        self._display_cache = PhaseModelCache(self._engine.func)
+
+        self._initializer: MultiStartInitializer | None = None
+        if start_config.multi_start is not None:
+            self._initializer = MultiStartInitializer(start_config.multi_start, self._engine.func)
+
+        self._refitter: DriftRefitter | None = None
+        if start_config.drift_refit is not None:
+            self._refitter = DriftRefitter(start_config.drift_refit, self._engine.func)
+
+        self._store: WarmStartStore | None = None
+        if start_config.warm_start is not None:
+            self._store = WarmStartStore(start_config.warm_start.path, self._engine.func)
+        self._save_pending = False
+
+        self._predictor: PhasePredictor | None = None
+        if start_config.phase_prediction is not None:
+            self._predictor = PhasePredictor(start_config.phase_prediction)
+        self.last_nfev: int = 0
+
+    @property
+    def config(self) -> AnalysisConfig:
+        """Current fit parameters."""
+        return self._config
+
+    @property
+    def refitter(self) -> DriftRefitter | None:
+        return self._refitter
+
+    @property
+    def predictor(self) -> PhasePredictor | None:
+        return self._predictor
+
+    def expect_phase_shift(self, shift: Angle) -> None:
+        """Phase change expected from a commanded correction, used to seed the next fit."""
+        if self._predictor is not None:
+            self._predictor.command(shift.Rad)
+
     def update(self, spectrum: Spectrum) -> None:
-        if self.current_phase is None:
-            new_config = self._initialize_fit_parameters(spectrum)
+        spectrum = self.reduce(spectrum)
+
+        first = self.current_phase is None
+        if first:
+            new_config = self._warm_start(spectrum)
+            if new_config is None:
+                new_config = self._initialize_fit_parameters(spectrum)
+                # only a full fit sets the reference residual; re-saving a
+                # warm start would let the acceptance limit grow every session
+                self._save_pending = True
+            if self._predictor is not None:
+                self._predictor.reset(new_config.phase.Rad)
         else:
+            if self._swap_in_refit():
+                self._save_pending = True
+                if self._predictor is not None:
+                    self._predictor.rebase(self._config.phase.Rad)
             new_config = self._fit_phase(spectrum)
 
+        if self._refitter is not None or self._save_pending:
+            residual = self._residual(spectrum, new_config)
+            if self._refitter is not None and not first:
+                self._refitter.observe(residual, spectrum, new_config)
+            if self._save_pending and self._store is not None:
+                self._store.save(new_config, residual, spectrum.wavelengths_nm)
+            self._save_pending = False
+
         self.current_phase = new_config.phase
         self._config = new_config
-    
+
+    def close(self) -> None:
+        if self._initializer is not None:
+            self._initializer.close()
+        if self._refitter is not None:
+            self._refitter.close()
+
+    def model(self, wavelengths_nm: list[float] | np.ndarray, config: AnalysisConfig | None = None) -> np.ndarray:
+        """
+        Model curve for the current parameters (or 'config'), from the
+        cached phase-only terms. The returned array is reused by the next call.
+        """
+        config = self._config if config is None else config
+        cache = self._display_cache
+        cache.prepare(wavelengths_nm, config)
+        return cache.evaluate(config.phase.Rad)
+
+    def reduce(self, spectrum: Spectrum) -> Spectrum:
+        """Pre-fit pixel binning / decimation according to the config."""
+        factor = self._config.binning_factor
+        if factor <= 1:
+            return spectrum
+        if self._config.binning_mode is BinningMode.DECIMATE:
+            return spectrum.decimated(factor)
+        return spectrum.binned(factor)
+
+    def _warm_start(self, spectrum: Spectrum) -> AnalysisConfig | None:
+        """
+        Saved fit from the last session, if it still fits this frame.
+        The phase is re-estimated first, since it drifts between sessions.
+        """
+        if self._store is None or self._config.warm_start is None:
+            return None
+
+        saved = self._store.load()
+        if saved is None:
+            return None
+
+        x = np.asarray(spectrum.wavelengths_nm, dtype=float)
+        if saved.axis_hash != axis_hash(x):
+            print("Warm start skipped: wavelength axis changed.")
+            return None
+
+        config = AnalysisConfig.from_fit_values(self._config, saved.values)
+        phase = self._linear.estimate(x, np.asarray(spectrum.intensity, dtype=float), config)
+        config = AnalysisConfig.from_fit_values(config, {"phase": phase})
+
+        residual = self._residual(spectrum, config)
+        limit = self._config.warm_start.tolerance * saved.residual
+        if not residual <= limit:
+            print(f"Warm start skipped: residual {residual:.3g} > {limit:.3g}.")
+            return None
+
+        print(f"Warm start from {saved.saved_at} (residual {residual:.3g}).")
+        return config
+
     def _initialize_fit_parameters(self, spectrum: Spectrum) -> AnalysisConfig:
-        
-        first_arg_name = self._get_first_arg_name()
-        model = lmfit.Model(usCFG_projection, independent_vars=[first_arg_name])
-        
-        fit_kwargs: dict[str, Any] = self._config.to_fit_kwargs(usCFG_projection)
-        fit_kwargs[first_arg_name] = spectrum.wavelengths_nm
-        
-        result = model.fit(spectrum.intensity, **fit_kwargs, max_nfev=int(10000))
+        if self._initializer is not None:
+            result = self._initializer.fit(spectrum, self._config)
+            return AnalysisConfig.from_fit_result(self._config, result)
+
+        result = self._engine.fit_full(spectrum, self._config, max_nfev=int(10000))
         return AnalysisConfig.from_fit_result(self._config, result)
-    
-    
-    def _fit_phase(self, spectrum: Spectrum) -> AnalysisConfig:
-        
-        first_arg_name = self._get_first_arg_name()
-        model = lmfit.Model(usCFG_projection, independent_vars=[first_arg_name])
 
-        floats = self._config.to_fit_kwargs(usCFG_projection)  
 
-        param_kwargs: dict[str, Any] = dict(floats)
+    def _fit_phase(self, spectrum: Spectrum) -> AnalysisConfig:
+        start = self._config
+        predicted = self._predictor.predict() if self._predictor is not None else None
+        if predicted is not None:
+            start = AnalysisConfig.from_fit_values(start, {"phase": predicted})
 
-        params = model.make_params(**param_kwargs)  
-        for name, par in params.items():
-            par.vary = (name == "phase")
+        if start.phase_estimator is PhaseEstimator.LINEAR:
+            phase = self._linear.estimate(
+                np.asarray(spectrum.wavelengths_nm, dtype=float),
+                np.asarray(spectrum.intensity, dtype=float),
+                start,
+            )
+            self.last_nfev = 0
+        else:
+            result = self._engine.fit_phase(spectrum, start)
+            phase = result.best_values["phase"]
+            self.last_nfev = result.nfev
 
-        x_kwargs: dict[str, Any] = {first_arg_name: spectrum.wavelengths_nm}
+        if self._predictor is not None:
+            phase = self._predictor.update(phase)
 
-        result = model.fit(
-            spectrum.intensity,
-            params=params,
-            **x_kwargs,
-        )
-        
-        return AnalysisConfig.from_fit_result(self._config, result)
+        return AnalysisConfig.from_fit_values(start, {"phase": phase})
+
+    def _swap_in_refit(self) -> bool:
+        if self._refitter is None:
+            return False
+        refit = self._refitter.poll(self._config)
+        if refit is None:
+            return False
+        self._config = refit
+        return True
 
-    def _get_first_arg_name(self) -> str:
-        sig = inspect.signature(usCFG_projection)
-        return next(iter(sig.parameters))
\ No newline at end of file
+    def _residual(self, spectrum: Spectrum, config: AnalysisConfig) -> float:
+        """RMS residual of 'config' on 'spectrum', from the cached model terms."""
+        cache = self._engine.model_cache
+        cache.prepare(spectrum.wavelengths_nm, config)
+        diff = np.asarray(spectrum.intensity, dtype=float) - cache.evaluate(config.phase.Rad)
+        return float(np.sqrt(np.mean(diff * diff)))
@@ -1,31 +1,68 @@
 # phase_control/analysis/plot.py
 import time
 import threading
+from typing import Optional, Sequence
 
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
 
-from base_lib.functions import usCFG_projection
-from base_lib.models import Angle
 from phase_control.analysis.config import AnalysisConfig
-from phase_control.analysis.phase_corrector import PhaseCorrector
-from phase_control.analysis.phase_tracker import PhaseTracker
+from phase_control.analysis.control_loop import ControlLoop
+from phase_control.analysis.phase_corrector import PHASE_TOLERANCE, STARTING_PHASE
+from phase_control.correction_io.config import RotatorConfig
 from phase_control.correction_io.elliptec_ell14 import ElliptecRotator
+from phase_control.correction_io.rotator_worker import RotatorWorker
+from phase_control.domain.blit_renderer import BlitRenderer
+from phase_control.domain.decimation import DecimatedLine
+from phase_control.domain.live_history import PhaseHistoryView, WaterfallView
+from phase_control.domain.startup_timeline import StartupTimeline
 from phase_control.domain.models import Spectrum
-from phase_control.domain.plotting import plot_model, plot_spectrogram
-from phase_control.stream_io import StreamMeta, FrameBuffer
+from phase_control.stream_io import FrameBuffer
+
+
+def create_figure() -> tuple[Figure, Sequence[Axes]]:
+    """
+    Window with the spectrum, waterfall and phase axes. Needs no stream
+    data, so it can be opened while the acquisition process starts up.
+    """
+    plt.ion()
+    fig, axes = plt.subplots(
+        3, 1, figsize=(8, 9), gridspec_kw={"height_ratios": [3, 2, 1.5]},
+    )
+    axes[1].sharex(axes[0])
+    fig.canvas.flush_events()
+    return fig, axes
 
 
 def run_analysis(
     buffer: FrameBuffer,
     stop_event: threading.Event,
+    rotator_config: RotatorConfig = RotatorConfig(),
+    calibrate: bool = False,
+    max_fps: float = 30.0,
+    history: int = 300,
+    figure: Optional[tuple[Figure, Sequence[Axes]]] = None,
+    rotator: Optional[RotatorWorker[ElliptecRotator]] = None,
+    timeline: Optional[StartupTimeline] = None,
 ) -> None:
-    
+    """
+    Live plot of the control loop.
+
+    Tracking and correction run on the ControlLoop thread at the full frame
+    rate; this loop only renders its latest snapshot, at most 'max_fps'
+    times per second. States in between are dropped.
+
+    Below the spectrum: a waterfall of the last 'history' rendered spectra
+    and the phase of the last 'history' rendered frames.
+
+    'figure': from create_figure(), otherwise created here.
+    'rotator' / 'timeline': see ControlLoop.
+    """
     config = AnalysisConfig()
-    phase_tracker = PhaseTracker(config)
-    phase_corrector = PhaseCorrector()
-    ell = ElliptecRotator(max_address = "0") 
-    
+    control = ControlLoop(buffer, config, rotator_config, calibrate, rotator=rotator, timeline=timeline)
+
      # X-axis from wavelengths if available, otherwise pixel indices
     if buffer.meta.wavelengths is not None:
         x = np.array(buffer.meta.wavelengths, dtype=float)
@@ -36,59 +73,64 @@ def run_analysis(
 
     spec0 = Spectrum.from_raw_data(x, np.ones_like(x)).cut(config.wavelength_range)
     # Matplotlib setup
-    plt.ion()
-    fig, ax = plt.subplots()
+    fig, (ax, ax_waterfall, ax_phase) = figure if figure is not None else create_figure()
 
+    # only the changing artists are redrawn per frame, on a cached background
+    renderer = BlitRenderer(fig)
     (line,) = ax.plot(spec0.wavelengths_nm, spec0.intensity) #for current spectrum
     (line2,) = ax.plot(spec0.wavelengths_nm, spec0.intensity) #for current fit
     (line3,) = ax.plot(spec0.wavelengths_nm, spec0.intensity)
-
-    first = True
+    waterfall = WaterfallView(ax_waterfall, spec0.wavelengths_nm, history)
+    phase_history = PhaseHistoryView(ax_phase, history)
+    for artist in (line, line2, line3, waterfall.image, phase_history.points):
+        renderer.add(artist)
+    # min/max envelope at the axes' pixel width, recomputed on zoom
+    spectrum_line, fit_line, reference_line = (DecimatedLine(l, spec0.wavelengths_nm) for l in (line, line2, line3))
 
     ax.set_xlabel(x_label)
     ax.set_ylabel("Counts")
+    ax.grid(axis = 'both')
+    ax_waterfall.set_xlabel(x_label)
+    # target phase and correction threshold, static background
+    ax_phase.axhspan(STARTING_PHASE.Deg - PHASE_TOLERANCE.Deg, STARTING_PHASE.Deg + PHASE_TOLERANCE.Deg, alpha=0.15)
+    ax_phase.grid(axis = 'both')
     fig.tight_layout()
-    fig.canvas.draw()
+    renderer.draw_full()
     fig.canvas.flush_events()
-    fig.gca().grid(axis = 'both')
 
+    frame_interval = 1.0 / max_fps
+    shown = 0
+    rendered = 0
+    reference_shown = False
+
+    control.start()
     try:
-        while plt.fignum_exists(fig.number) and not stop_event.is_set():
-            current_spectrum = buffer.get_latest().cut(config.wavelength_range)
-            if current_spectrum is None:
-                # No data yet, avoid busy-wait
-                time.sleep(0.01)
-                continue
-
-            phase_tracker.update(current_spectrum)
-
-            if first:
-                phase_tracker._config.phase = Angle(0)
-                line3.set_ydata(usCFG_projection(current_spectrum.wavelengths_nm, **phase_tracker._config.to_fit_kwargs(usCFG_projection)))
-                first = False
-    
-            if phase_tracker.current_phase is None:
-                raise ValueError("Should have a value.")
-            
-            correction_angle = phase_corrector.update(phase_tracker.current_phase)
-            
-            print("Rotating", correction_angle.Deg)
-            ell.rotate(correction_angle)
-            
-
-            line.set_ydata(current_spectrum.intensity)
-            line2.set_ydata(usCFG_projection(current_spectrum.wavelengths_nm, **phase_tracker._config.to_fit_kwargs(usCFG_projection)))
-            
-            ax.relim()
-            ax.autoscale_view()
-
-            fig.canvas.draw()
-            fig.canvas.flush_events()
-            time.sleep(0.02)
-            
+        while plt.fignum_exists(fig.number) and not stop_event.is_set() and control.running:
+            t0 = time.monotonic()
+
+            snapshot = control.snapshots.latest()
+            if snapshot is not None and snapshot.index != shown:
+                shown = snapshot.index
+                spectrum_line.set_ydata(snapshot.intensity)
+                fit_line.set_ydata(snapshot.model)
+                if not reference_shown and snapshot.reference is not None:
+                    reference_line.set_ydata(snapshot.reference)
+                    reference_shown = True
+                waterfall.push(snapshot.intensity)
+                if phase_history.push(snapshot.acquired_at, snapshot.phase.Deg):
+                    renderer.invalidate()
+                renderer.render()
+                rendered += 1
+
+            # keep the window responsive until the next render slot
+            remaining = frame_interval - (time.monotonic() - t0)
+            fig.canvas.start_event_loop(max(remaining, 0.001))
 
     except KeyboardInterrupt:
         print("\nLive plot interrupted by user.")
     finally:
-        print("Live plot finished.")
-        
\ No newline at end of file
+        renderer.close()
+        control.stop()
+        if control.error is not None:
+            print("Control loop failed:", repr(control.error))
+        print(f"Live plot finished ({control.frames} frames processed, {rendered} shown).")
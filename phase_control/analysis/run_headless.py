@@ -0,0 +1,76 @@
+# phase_control/analysis/run_headless.py
+"""
+Control loop without a GUI, for unattended runs.
+
+Responsibilities:
+- run ControlLoop (tracking, correction, rotator) at the full frame rate
+- every 'interval' seconds write one line of metrics: frame rate, fit
+  latency percentiles, current phase, correction count, frames skipped
+  during rotator moves
+
+This module does NOT import pyplot or the plotting modules. matplotlib
+itself is still loaded: lmfit, needed for the fits, imports it.
+"""
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, TextIO
+
+from phase_control.analysis.control_loop import ControlLoop, MetricsReport
+from phase_control.correction_io.config import RotatorConfig
+from phase_control.correction_io.elliptec_ell14 import ElliptecRotator
+from phase_control.correction_io.rotator_worker import RotatorWorker
+from phase_control.domain.startup_timeline import StartupTimeline
+from phase_control.stream_io import FrameBuffer
+
+
+def run_headless(
+    buffer: FrameBuffer,
+    stop_event: threading.Event,
+    rotator_config: RotatorConfig = RotatorConfig(),
+    calibrate: bool = False,
+    interval: float = 10.0,
+    metrics_path: Optional[Path] = None,
+    rotator: Optional[RotatorWorker[ElliptecRotator]] = None,
+    timeline: Optional[StartupTimeline] = None,
+) -> None:
+    """
+    Run until stop_event is set, the control loop ends or Ctrl+C.
+    Metrics go to stdout, or are appended to 'metrics_path'.
+    'rotator' / 'timeline': see ControlLoop.
+    """
+    control = ControlLoop(
+        buffer, rotator_config=rotator_config, calibrate=calibrate, rotator=rotator, timeline=timeline,
+    )
+    out: TextIO = sys.stdout if metrics_path is None else open(metrics_path, "a", encoding="utf-8", buffering=1)
+
+    control.start()
+    control.metrics.take()  # start the first period now
+    try:
+        while not stop_event.wait(interval) and control.running:
+            out.write(_format_metrics(control, control.metrics.take(), buffer) + "\n")
+            out.flush()
+    except KeyboardInterrupt:
+        print("\nHeadless run interrupted by user.")
+    finally:
+        control.stop()
+        if control.error is not None:
+            print("Control loop failed:", repr(control.error))
+        if out is not sys.stdout:
+            out.close()
+        print(f"Headless run finished ({control.frames} frames processed, {control.corrections} corrections).")
+
+
+def _format_metrics(control: ControlLoop, report: MetricsReport, buffer: FrameBuffer) -> str:
+    snapshot = control.snapshots.latest()
+    phase = f"{snapshot.phase.Deg:7.2f}" if snapshot is not None else "    n/a"
+    p50, p90, p99 = report.fit_ms
+    return (
+        f"{datetime.now().isoformat(timespec='seconds')} "
+        f"fps {report.fps:6.1f} | "
+        f"fit ms p50 {p50:6.2f} p90 {p90:6.2f} p99 {p99:6.2f} max {report.fit_max_ms:6.2f} | "
+        f"phase {phase}° | "
+        f"corrections {control.corrections} | "
+        f"skipped in motion {buffer.skipped_in_motion}"
+    )
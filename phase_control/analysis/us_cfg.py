@@ -0,0 +1,96 @@
+"""
+Closed-form usCFG model terms.
+
+    S = baseline + (1 - baseline) * G(λ) * sin²(phase + acceleration * (λ - starting_wavelength)²)
+    G(λ) = exp(-4 ln2 * (λ - carrier_wavelength)² / bandwidth²)     (bandwidth = FWHM)
+
+All wavelengths in nm, phase in rad. This mirrors base_lib.functions.usCFG_projection;
+'reproduces' checks that assumption numerically before anything here is used in a fit.
+"""
+import math
+from typing import Any, Callable, Mapping
+
+import numpy as np
+
+_FOUR_LN2 = 4.0 * math.log(2.0)
+
+
+def us_cfg_model(
+    x: np.ndarray,
+    carrier_wavelength: float,
+    starting_wavelength: float,
+    bandwidth: float,
+    baseline: float,
+    phase: float,
+    acceleration: float,
+) -> np.ndarray:
+    x = np.asarray(x, dtype=float)
+    envelope = np.exp(-_FOUR_LN2 * (x - carrier_wavelength) ** 2 / bandwidth**2)
+    return baseline + (1.0 - baseline) * envelope * np.sin(phase + acceleration * (x - starting_wavelength) ** 2) ** 2
+
+
+def us_cfg_jacobian(
+    x: np.ndarray,
+    carrier_wavelength: float,
+    starting_wavelength: float,
+    bandwidth: float,
+    baseline: float,
+    phase: float,
+    acceleration: float,
+) -> dict[str, np.ndarray]:
+    """
+    Partial derivatives of us_cfg_model with respect to every parameter,
+    each as an array over x.
+    """
+    x = np.asarray(x, dtype=float)
+
+    dc = x - carrier_wavelength
+    ds = x - starting_wavelength
+    chirp = ds * ds
+
+    envelope = np.exp(-_FOUR_LN2 * dc * dc / bandwidth**2)
+    theta = phase + acceleration * chirp
+    sin2 = np.sin(theta) ** 2
+
+    amp = 1.0 - baseline
+    g_sin2 = envelope * sin2                       # G sin²θ
+    d_theta = amp * envelope * np.sin(2.0 * theta)  # ∂S/∂θ
+    d_envelope = amp * g_sin2 * 2.0 * _FOUR_LN2     # common factor of the envelope terms
+
+    return {
+        "carrier_wavelength": d_envelope * dc / bandwidth**2,
+        "starting_wavelength": d_theta * (-2.0 * acceleration * ds),
+        "bandwidth": d_envelope * dc * dc / bandwidth**3,
+        "baseline": 1.0 - g_sin2,
+        "phase": d_theta,
+        "acceleration": d_theta * chirp,
+    }
+
+
+def reproduces(
+    func: Callable[..., Any],
+    x: np.ndarray,
+    values: Mapping[str, float],
+    rtol: float = 1e-7,
+    atol: float = 1e-10,
+) -> bool:
+    """
+    True if us_cfg_model gives the same values as 'func' on 'x' for 'values'
+    and for a few phase / acceleration variations of it.
+    """
+    x = np.asarray(x, dtype=float)
+    if x.size == 0:
+        return False
+
+    for d_phase, acc_scale in ((0.0, 1.0), (0.7, 1.0), (-1.3, 0.5)):
+        kwargs = dict(values)
+        kwargs["phase"] = kwargs["phase"] + d_phase
+        kwargs["acceleration"] = kwargs["acceleration"] * acc_scale
+        try:
+            reference = np.asarray(func(x, **kwargs), dtype=float)
+        except Exception:
+            return False
+        if reference.shape != x.shape or not np.allclose(us_cfg_model(x, **kwargs), reference, rtol=rtol, atol=atol):
+            return False
+
+    return True
@@ -0,0 +1,62 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from base_lib.functions import usCFG_projection
+from phase_control.analysis.config import AnalysisConfig
+from phase_control.domain.json_file import atomic_write_json, read_json
+
+
+def axis_hash(wavelengths_nm: Any) -> str:
+    """Hash of a wavelength axis, insensitive to float noise below 1e-6 nm."""
+    x = np.round(np.asarray(wavelengths_nm, dtype=float), 6)
+    return hashlib.sha1(x.tobytes()).hexdigest()
+
+
+@dataclass
+class WarmStart:
+    """One saved fit: model values (nm / rad / float), its RMS residual and the axis it belongs to."""
+    values: dict[str, float]
+    residual: float
+    axis_hash: str
+    saved_at: str
+
+
+class WarmStartStore:
+    """
+    JSON file holding the last converged fit, written atomically
+    (atomic_write_json).
+    """
+
+    def __init__(self, path: Path, func: Callable[..., Any] = usCFG_projection) -> None:
+        self._path = Path(path)
+        self._func = func
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self) -> Optional[WarmStart]:
+        return read_json(self._path, _parse_warm_start, "warm start file")
+
+    def save(self, config: AnalysisConfig, residual: float, wavelengths_nm: Any) -> None:
+        data = {
+            "values": config.to_fit_kwargs(self._func),
+            "residual": residual,
+            "axis_hash": axis_hash(wavelengths_nm),
+            "saved_at": datetime.now().isoformat(),
+        }
+        atomic_write_json(self._path, data, "warm start")
+
+
+def _parse_warm_start(raw: Any) -> WarmStart:
+    return WarmStart(
+        values={k: float(v) for k, v in raw["values"].items()},
+        residual=float(raw["residual"]),
+        axis_hash=str(raw["axis_hash"]),
+        saved_at=str(raw.get("saved_at", "")),
+    )
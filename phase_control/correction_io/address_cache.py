@@ -0,0 +1,42 @@
+# phase_control/correction_io/address_cache.py
+"""
+Last Elliptec device found on the bus, so the next start can address it
+directly instead of scanning min_address..max_address.
+
+Written atomically (atomic_write_json).
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Optional
+
+from phase_control.domain.json_file import atomic_write_json, read_json
+
+
+class ElliptecAddressCache:
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self, port: str) -> Optional[str]:
+        """Cached bus address ('0'..'F') of the device on 'port', None if unknown."""
+
+        def parse(raw: Any) -> Optional[str]:
+            if str(raw["port"]) != port:
+                return None
+            address = str(raw["address"])
+            int(address, 16)
+            return address
+
+        return read_json(self._path, parse, "Elliptec address cache")
+
+    def save(self, port: str, address: str) -> None:
+        data = {
+            "port": port,
+            "address": address,
+            "saved_at": datetime.now().isoformat(),
+        }
+        atomic_write_json(self._path, data, "Elliptec address")
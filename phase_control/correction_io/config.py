@@ -0,0 +1,43 @@
+# phase_control/correction_io/config.py
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+
+class RotatorBackend(Enum):
+    THORLABS = "thorlabs"     # real device via the Thorlabs .NET DLL
+    SIMULATED = "simulated"   # SimulatedElliptecBackend, no hardware needed
+
+
+@dataclass(frozen=True)
+class SimulatedRotatorConfig:
+    """
+    Motion model of SimulatedElliptecBackend.
+    """
+    speed_deg_per_s: float = 200.0
+    command_latency: float = 0.03       # s, serial round trip before the mount starts
+    settle_time: float = 0.05           # s
+    overshoot_deg: float = 0.3          # reported position error right after arrival
+    position_limits_deg: Optional[tuple[float, float]] = None   # None: endless rotation mount
+    start_position_deg: float = 0.0     # before homing
+    connect_time: float = 0.2           # s, port open
+    address: str = "0"                  # bus address the simulated mount answers on
+    scan_time_per_address: float = 0.1  # s per address in the scanned range
+
+
+@dataclass(frozen=True)
+class RotatorConfig:
+    """
+    Which Elliptec backend to use and how to reach it.
+
+    The address found by the first scan of min_address..max_address is
+    kept in 'address_cache' and tried alone on the next start; the full
+    range is only scanned again if it does not answer. None: always scan.
+    """
+    backend: RotatorBackend = RotatorBackend.THORLABS
+    port: str = "COM6"
+    min_address: str = "0"
+    max_address: str = "F"
+    simulation: SimulatedRotatorConfig = SimulatedRotatorConfig()
+    address_cache: Optional[Path] = Path(__file__).resolve().parents[1] / ".elliptec_address.json"
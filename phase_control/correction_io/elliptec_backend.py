@@ -0,0 +1,49 @@
+# phase_control/correction_io/elliptec_backend.py
+"""
+Device layer below ElliptecRotator.
+
+Responsibilities:
+- connect to one Elliptec device and describe it
+- issue home / relative move commands
+- report the current device position
+
+Angle bookkeeping, the ANGLE_RANGE wrap and waiting for a move to finish
+stay in ElliptecRotator, so every backend behaves the same from above.
+
+Backends:
+- ThorlabsElliptecBackend (thorlabs_elliptec.py): Thorlabs .NET DLL via
+  pythonnet, Windows only; imported only when selected
+- SimulatedElliptecBackend (simulated_elliptec.py): pure Python model
+  with speed, settle time and position limits
+"""
+from typing import Optional, Protocol
+
+
+class ElliptecBackend(Protocol):
+
+    def connect(self, port: str, min_address: str, max_address: str) -> list[str]:
+        """
+        Connect to the first configurable device in min_address..max_address;
+        returns its description lines. Raises if none answers.
+        """
+        ...
+
+    @property
+    def address(self) -> Optional[str]:
+        """Bus address ('0'..'F') of the connected device, None before connect()."""
+        ...
+
+    def home(self) -> None:
+        """Start homing; returns before the move has finished."""
+        ...
+
+    def move_relative(self, angle_deg: float) -> None:
+        """Start a relative move; returns before the move has finished."""
+        ...
+
+    def read_position(self) -> Optional[float]:
+        """Current position in degrees, or None if it cannot be read."""
+        ...
+
+    def close(self) -> None:
+        ...
@@ -1,16 +1,46 @@
 import time
-import clr
-from System import Decimal
+from collections import deque
+from typing import Optional
 from base_lib.models import Angle, AngleUnit, Range
 
+from phase_control.correction_io.address_cache import ElliptecAddressCache
+from phase_control.correction_io.config import RotatorBackend, RotatorConfig
+from phase_control.correction_io.elliptec_backend import ElliptecBackend
+from phase_control.correction_io.rotator_worker import RotatorWorker
+
 # === Konstanten ===
 ANGLE_RANGE = Range(Angle(-90, AngleUnit.DEG), Angle(90, AngleUnit.DEG))
 OUT_OF_RANGE_RELATIVE_ANGLE = Angle(90, AngleUnit.DEG)
 HOME_ANGLE = Angle(0, AngleUnit.DEG)
 
-# === DLL laden ===
-clr.AddReference(r"C:\Program Files\Thorlabs\Elliptec\Thorlabs.Elliptec.ELLO_DLL.dll")
-from Thorlabs.Elliptec.ELLO_DLL import ELLDevicePort, ELLDevices, ELLBaseDevice
+# Bewegungsende: Position pollen statt fester Wartezeit
+MOVE_TIMEOUT = 2.0      # s, frühere feste Wartezeit nach MoveRelative
+HOME_TIMEOUT = 1.0      # s, frühere feste Wartezeit nach Home
+POLL_INTERVAL = 0.02    # s
+POSITION_TOLERANCE = Angle(0.05, AngleUnit.DEG)
+LATENCY_HISTORY = 200
+
+
+
+def create_backend(config: RotatorConfig) -> ElliptecBackend:
+    """
+    Backend selected by 'config'. The Thorlabs backend (pythonnet + DLL)
+    is only imported here, so this module imports on any platform.
+    """
+    if config.backend is RotatorBackend.SIMULATED:
+        from phase_control.correction_io.simulated_elliptec import SimulatedElliptecBackend
+        return SimulatedElliptecBackend(config.simulation)
+
+    from phase_control.correction_io.thorlabs_elliptec import ThorlabsElliptecBackend
+    return ThorlabsElliptecBackend()
+
+
+def start_rotator(config: RotatorConfig) -> "RotatorWorker[ElliptecRotator]":
+    """
+    RotatorWorker that starts connecting and homing the configured rotator
+    right away, on its own thread.
+    """
+    return RotatorWorker(lambda: ElliptecRotator.from_config(config), name="ElliptecRotatorThread")
 
 
 class ElliptecRotator:
@@ -19,14 +49,46 @@ class ElliptecRotator:
         port: str = "COM6",
         min_address: str = "0",
         max_address: str = "F",
+        backend: Optional[ElliptecBackend] = None,
+        address_cache: Optional[ElliptecAddressCache] = None,
     ) -> None:
-        self._device = None
-        self._ell_devices = None
+        # default: real device
+        self._backend = backend if backend is not None else create_backend(RotatorConfig())
+        self._address_cache = address_cache
 
         self._current_angle: Angle = Angle(0, AngleUnit.DEG)
+        self._latencies: deque[float] = deque(maxlen=LATENCY_HISTORY)
 
         self._initialize(port, min_address, max_address)
 
+    @classmethod
+    def from_config(cls, config: RotatorConfig) -> "ElliptecRotator":
+        return cls(
+            port=config.port,
+            min_address=config.min_address,
+            max_address=config.max_address,
+            backend=create_backend(config),
+            address_cache=ElliptecAddressCache(config.address_cache) if config.address_cache is not None else None,
+        )
+
+    @property
+    def backend(self) -> ElliptecBackend:
+        return self._backend
+
+    @property
+    def angle(self) -> Angle:
+        """Current waveplate angle relative to home."""
+        return self._current_angle
+
+    @property
+    def move_latencies(self) -> list[float]:
+        """Measured durations (s) of the most recent moves, oldest first."""
+        return list(self._latencies)
+
+    @property
+    def last_move_latency(self) -> Optional[float]:
+        return self._latencies[-1] if self._latencies else None
+
 
     def rotate(self, angle: Angle) -> None:
         
@@ -43,15 +105,14 @@ class ElliptecRotator:
         print("--------------------------")
 
     def home(self) -> None:
-        self._device.Home(ELLBaseDevice.DeviceDirection.Linear)
-        time.sleep(1.0)
+        t0 = time.monotonic()
+        self._backend.home()
+        self._wait_until_at(HOME_ANGLE, HOME_TIMEOUT)
+        self._latencies.append(time.monotonic() - t0)
         self._current_angle = Angle(0, AngleUnit.DEG)
 
     def close(self) -> None:
-        try:
-            ELLDevicePort.Disconnect()
-        except Exception:
-            pass
+        self._backend.close()
 
     # ------------------------------------------------------------------    
     # internal helpers
@@ -59,43 +120,72 @@ class ElliptecRotator:
 
     def _initialize(self, port, min_address, max_address) -> None:
         print(f"Connecting to Elliptec device on {port} ...")
-        ELLDevicePort.Connect(port)
-
-        ell_devices = ELLDevices()
-        devices = ell_devices.ScanAddresses(min_address, max_address)
-        if not devices:
-            raise RuntimeError("No Elliptec devices found on bus.")
-
-        addressed_device = None
-        for dev in devices:
-            if ell_devices.Configure(dev):
-                addressed_device = ell_devices.AddressedDevice(dev[0])
-                break
+        t0 = time.monotonic()
+        description, how = self._connect(port, min_address, max_address)
 
-        if addressed_device is None:
-            raise RuntimeError("No configurable Elliptec device found.")
-
-        self._ell_devices = ell_devices
-        self._device = addressed_device
-
-        device_info = self._device.DeviceInfo
-        print("Connected to Elliptec device:")
-        for line in device_info.Description():
+        print(f"Connected to Elliptec device ({how}, {time.monotonic() - t0:.2f} s):")
+        for line in description:
             print("  ", line)
 
         print("Homing device...")
-        self._device.Home(ELLBaseDevice.DeviceDirection.Linear)
-        time.sleep(1.0)
-        print("Device homed.")
-
-        # Startzustand: delta = 0
-        self._current_angle = Angle(0, AngleUnit.DEG)
+        self.home()
+        print(f"Device homed ({self._latencies[-1]:.2f} s).")
+
+    def _connect(self, port: str, min_address: str, max_address: str) -> tuple[list[str], str]:
+        """
+        Try the cached address alone first; if it does not answer, scan
+        min_address..max_address and cache the address found.
+        Returns (description lines, how it connected, for the log).
+        """
+        cache = self._address_cache
+        cached = cache.load(port) if cache is not None else None
+        if cached is not None and int(min_address, 16) <= int(cached, 16) <= int(max_address, 16):
+            try:
+                return self._backend.connect(port, cached, cached), f"cached address {cached}"
+            except Exception as exc:
+                print(f"Cached Elliptec address {cached} did not answer ({exc}); scanning {min_address}..{max_address}.")
+                self._backend.close()
+
+        description = self._backend.connect(port, min_address, max_address)
+        address = self._backend.address
+        if cache is not None and address is not None and address != cached:
+            cache.save(port, address)
+        return description, f"scanned {min_address}..{max_address}, address {address}"
 
     def _move_relative(self, angle: Angle) -> None:
-        d = Decimal(angle.Deg)
-        self._device.MoveRelative(d)
+        t0 = time.monotonic()
+        self._backend.move_relative(angle.Deg)
         self._current_angle = Angle(self._current_angle + angle)
-        time.sleep(2.0)
+        self._wait_until_at(self._current_angle, MOVE_TIMEOUT)
+        self._latencies.append(time.monotonic() - t0)
+
+    def _wait_until_at(self, target: Angle, timeout: float) -> None:
+        """
+        Poll the device position until it is within POSITION_TOLERANCE of
+        'target' (modulo 360°). If the position cannot be read, wait the
+        full 'timeout' like the former fixed sleeps.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            position = self._read_position()
+            if position is None:
+                time.sleep(max(0.0, deadline - time.monotonic()))
+                return
+
+            diff = (position.Deg - target.Deg + 180.0) % 360.0 - 180.0
+            if abs(diff) <= POSITION_TOLERANCE.Deg:
+                return
+
+            if time.monotonic() >= deadline:
+                print(f"Elliptec did not reach {target.Deg:.2f}° within {timeout} s (at {position.Deg:.2f}°).")
+                return
+            time.sleep(POLL_INTERVAL)
+
+    def _read_position(self) -> Optional[Angle]:
+        position = self._backend.read_position()
+        if position is None:
+            return None
+        return Angle(position, AngleUnit.DEG)
 
     def _validate_new_delta_angle(self, new_angle: Angle) -> None:
         
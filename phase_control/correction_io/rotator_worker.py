@@ -0,0 +1,261 @@
+# phase_control/correction_io/rotator_worker.py
+"""
+Runs all rotator I/O on one dedicated thread.
+
+Responsibilities:
+- create (connect + home) the rotator on the worker thread
+- execute submitted commands in order, one at a time
+- report completion through concurrent.futures.Future objects
+
+The caller (e.g. the analysis loop) never blocks on a move; it submits
+a command, gets a Future back and keeps processing frames.
+
+request_rotation() adds rate limiting on top: pending relative moves are
+coalesced into one net move, moves are at least 'min_interval' seconds
+apart, net moves below 'min_step' are dropped, and corrections computed
+from frames acquired while the rotator was moving or settling are
+rejected.
+
+Every move (rate-limited, plain rotate() or home()) is published as a
+motion interval [start, end + settle_time] on the time.monotonic() clock;
+overlaps_motion() lets the frame buffer drop exposures that overlap one.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Generic, Optional, TypeVar
+
+from base_lib.models import Angle, AngleUnit
+
+R = TypeVar("R")
+T = TypeVar("T")
+
+
+class RotatorWorker(Generic[R]):
+    """
+    Command queue in front of a rotator object.
+
+    'factory' builds the rotator (e.g. ElliptecRotator) on the worker
+    thread, so connecting and homing do not block the caller either.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], R],
+        name: str = "RotatorWorkerThread",
+        min_interval: float = 0.5,
+        min_step: Angle = Angle(0.2, AngleUnit.DEG),
+        settle_time: float = 0.05,
+    ) -> None:
+        self._queue: "queue.Queue[Optional[tuple[Callable[[R], Any], Future[Any]]]]" = queue.Queue()
+        self._ready: Future[R] = Future()
+
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        # coalescing / rate limiting (see request_rotation)
+        self._min_interval = min_interval
+        self._min_step_deg = abs(min_step.Deg)
+        self._settle_time = settle_time
+        self._net_deg = 0.0
+        self._flush: Optional[Future[Angle]] = None   # queued, not yet started
+        self._in_motion = False                      # from first request until the move is done
+        self._settled_at = float("-inf")             # monotonic time the last move settled
+        self._last_move_end = float("-inf")
+
+        # motion intervals for overlaps_motion()
+        self._motion_start: Optional[float] = None   # move currently running since
+        self._motions: deque[tuple[float, float]] = deque(maxlen=64)
+
+        self.moves = 0
+        self.dropped = 0
+        self.skipped_small = 0
+
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(factory,),
+            name=name,
+            daemon=True,
+        )
+        self._thread.start()
+
+    # ------------------------------------------------------------------ #
+    # Properties
+    # ------------------------------------------------------------------ #
+
+    @property
+    def ready(self) -> "Future[R]":
+        """Completes with the rotator once it is connected and homed."""
+        return self._ready
+
+    @property
+    def busy(self) -> bool:
+        """True while commands are queued or running."""
+        with self._lock:
+            return self._pending > 0
+
+    @property
+    def motion_intervals(self) -> list[tuple[float, float]]:
+        """Recent finished moves as (start, settled) monotonic times, oldest first."""
+        with self._lock:
+            return list(self._motions)
+
+    def overlaps_motion(self, start: float, end: float) -> bool:
+        """True if [start, end] (monotonic) overlaps a running or recent move."""
+        with self._lock:
+            if self._motion_start is not None and end > self._motion_start:
+                return True
+            for move_start, move_end in reversed(self._motions):
+                if move_end <= start:
+                    break
+                if move_start < end:
+                    return True
+            return False
+
+    # ------------------------------------------------------------------ #
+    # Commands
+    # ------------------------------------------------------------------ #
+
+    def submit(self, command: Callable[[R], T]) -> "Future[T]":
+        """Queue 'command(rotator)' and return a Future for its result."""
+        with self._lock:
+            return self._enqueue(command)
+
+    def rotate(self, angle: Angle) -> "Future[None]":
+        return self.submit(lambda rotator: self._move(lambda: rotator.rotate(angle)))  # type: ignore[attr-defined]
+
+    def request_rotation(
+        self,
+        angle: Angle,
+        acquired_at: Optional[float] = None,
+    ) -> "Optional[Future[Angle]]":
+        """
+        Rate-limited relative move.
+
+        'acquired_at' is the monotonic time the frame behind this correction
+        was acquired. Such corrections are dropped (None is returned) while a
+        move is pending or running, and for frames acquired before the last
+        move settled. Requests without 'acquired_at' are added to the pending
+        net move.
+
+        The returned Future completes with the net angle actually moved
+        (0 if it was below 'min_step'); coalesced requests share it.
+        """
+        with self._lock:
+            if acquired_at is not None and (self._in_motion or acquired_at < self._settled_at):
+                self.dropped += 1
+                return None
+
+            self._net_deg += angle.Deg
+            self._in_motion = True
+
+            if self._flush is None:
+                self._flush = self._enqueue(self._run_net_move)
+            return self._flush
+
+    def home(self) -> "Future[None]":
+        return self.submit(lambda rotator: self._move(rotator.home))  # type: ignore[attr-defined]
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Finish queued commands, close the rotator and stop the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+
+    # ------------------------------------------------------------------ #
+    # Worker thread
+    # ------------------------------------------------------------------ #
+
+    def _enqueue(self, command: Callable[[R], T]) -> "Future[T]":
+        # caller holds self._lock
+        future: Future[T] = Future()
+        self._pending += 1
+        self._queue.put((command, future))
+        return future
+
+    def _run_net_move(self, rotator: R) -> Angle:
+        wait = self._last_move_end + self._min_interval - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+        with self._lock:
+            net_deg = self._net_deg
+            self._net_deg = 0.0
+            self._flush = None
+
+        if abs(net_deg) < self._min_step_deg:
+            with self._lock:
+                self._in_motion = self._flush is not None
+                self.skipped_small += 1
+            return Angle(0)
+
+        angle = Angle(net_deg, AngleUnit.DEG)
+        try:
+            self._move(lambda: rotator.rotate(angle))  # type: ignore[attr-defined]
+        finally:
+            with self._lock:
+                self._in_motion = self._flush is not None
+                self.moves += 1
+        return angle
+
+    def _move(self, action: Callable[[], None]) -> None:
+        """Run a blocking move and publish its motion interval."""
+        with self._lock:
+            self._motion_start = time.monotonic()
+        try:
+            action()
+        finally:
+            now = time.monotonic()
+            with self._lock:
+                assert self._motion_start is not None
+                self._last_move_end = now
+                self._settled_at = now + self._settle_time
+                self._motions.append((self._motion_start, self._settled_at))
+                self._motion_start = None
+
+    def _run(self, factory: Callable[[], R]) -> None:
+        created: list[R] = []
+        try:
+            # creating the rotator homes it: publish that as a move too
+            self._move(lambda: created.append(factory()))
+            rotator = created[0]
+        except BaseException as exc:
+            self._ready.set_exception(exc)
+            self._fail_queued(exc)
+            return
+
+        self._ready.set_result(rotator)
+
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+
+                command, future = item
+                try:
+                    if future.set_running_or_notify_cancel():
+                        try:
+                            future.set_result(command(rotator))
+                        except BaseException as exc:
+                            future.set_exception(exc)
+                finally:
+                    with self._lock:
+                        self._pending -= 1
+        finally:
+            close = getattr(rotator, "close", None)
+            if close is not None:
+                close()
+
+    def _fail_queued(self, exc: BaseException) -> None:
+        # rotator could not be created: fail everything that is or will be queued
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            _, future = item
+            if future.set_running_or_notify_cancel():
+                future.set_exception(exc)
+            with self._lock:
+                self._pending -= 1
@@ -0,0 +1,136 @@
+# phase_control/correction_io/simulated_elliptec.py
+"""
+Simulated Elliptec backend for running the control loop off the lab machine.
+
+Motion model of one move (times from the command, monotonic clock):
+- 'command_latency': serial round trip, the device has not moved yet
+- |delta| / 'speed_deg_per_s': constant-speed travel to the target
+- 'settle_time': the reported position rings down from 'overshoot_deg'
+  past the target to the target
+
+connect() takes 'connect_time' plus 'scan_time_per_address' for every
+address in the scanned range and fails like the real bus if 'address'
+is not in it.
+
+Moves whose target lies outside 'position_limits_deg' are rejected like a
+device error. The ±90° ANGLE_RANGE wrap is done by ElliptecRotator on top,
+so it behaves exactly as with the real device.
+"""
+import threading
+import time
+from typing import Optional
+
+from phase_control.correction_io.config import SimulatedRotatorConfig
+
+
+class SimulatedElliptecBackend:
+
+    def __init__(self, settings: SimulatedRotatorConfig = SimulatedRotatorConfig()) -> None:
+        self._settings = settings
+        self._lock = threading.Lock()
+
+        # current move: start position, target, command time
+        self._start = settings.start_position_deg
+        self._target = settings.start_position_deg
+        self._commanded_at = float("-inf")
+
+        self.commands = 0
+        self._address: Optional[str] = None
+
+    # ------------------------------------------------------------------ #
+    # Properties (simulation side, e.g. for synthesizing spectra)
+    # ------------------------------------------------------------------ #
+
+    @property
+    def position_deg(self) -> float:
+        """True position right now, without the settling overshoot."""
+        return self._position(time.monotonic(), overshoot=False)
+
+    @property
+    def moving(self) -> bool:
+        with self._lock:
+            return time.monotonic() < self._settled_at()
+
+    # ------------------------------------------------------------------ #
+    # ElliptecBackend
+    # ------------------------------------------------------------------ #
+
+    def connect(self, port: str, min_address: str, max_address: str) -> list[str]:
+        s = self._settings
+        low, high = int(min_address, 16), int(max_address, 16)
+        time.sleep(s.connect_time + s.scan_time_per_address * max(high - low + 1, 0))
+        if not low <= int(s.address, 16) <= high:
+            raise RuntimeError("No Elliptec devices found on bus.")
+
+        self._address = s.address
+        return [
+            "Simulated Elliptec rotation mount",
+            f"Port: {port}, addresses {min_address}..{max_address}",
+            f"Speed: {self._settings.speed_deg_per_s:g} deg/s, settle time: {self._settings.settle_time:g} s",
+        ]
+
+    @property
+    def address(self) -> Optional[str]:
+        return self._address
+
+    def home(self) -> None:
+        self._start_move(0.0)
+
+    def move_relative(self, angle_deg: float) -> None:
+        with self._lock:
+            target = self._target + angle_deg
+        self._start_move(target)
+
+    def read_position(self) -> Optional[float]:
+        return self._position(time.monotonic(), overshoot=True)
+
+    def close(self) -> None:
+        pass
+
+    # ------------------------------------------------------------------ #
+    # Motion model
+    # ------------------------------------------------------------------ #
+
+    def _start_move(self, target: float) -> None:
+        s = self._settings
+        if s.position_limits_deg is not None:
+            low, high = s.position_limits_deg
+            if not low <= target <= high:
+                raise RuntimeError(f"Simulated Elliptec: target {target:.2f}° outside travel limits [{low}, {high}]°.")
+
+        now = time.monotonic()
+        start = self._position(now, overshoot=False)
+        with self._lock:
+            self._start = start
+            self._target = target
+            self._commanded_at = now
+            self.commands += 1
+
+    def _arrival(self) -> float:
+        # caller holds self._lock
+        s = self._settings
+        travel = abs(self._target - self._start) / s.speed_deg_per_s
+        return self._commanded_at + s.command_latency + travel
+
+    def _settled_at(self) -> float:
+        # caller holds self._lock
+        return self._arrival() + self._settings.settle_time
+
+    def _position(self, t: float, overshoot: bool) -> float:
+        s = self._settings
+        with self._lock:
+            start, target = self._start, self._target
+            departure = self._commanded_at + s.command_latency
+            arrival = self._arrival()
+
+        if t <= departure:
+            return start
+
+        direction = 1.0 if target >= start else -1.0
+        if t < arrival:
+            return start + direction * s.speed_deg_per_s * (t - departure)
+
+        if overshoot and s.settle_time > 0 and t < arrival + s.settle_time:
+            remaining = 1.0 - (t - arrival) / s.settle_time
+            return target + direction * s.overshoot_deg * remaining
+        return target
@@ -0,0 +1,72 @@
+# phase_control/correction_io/thorlabs_elliptec.py
+"""
+Elliptec backend on top of the Thorlabs ELLO .NET DLL.
+
+Importing this module loads pythonnet and the DLL, so it is only
+imported once this backend is actually selected.
+"""
+from typing import Optional
+
+import clr
+from System import Decimal
+
+DLL_PATH = r"C:\Program Files\Thorlabs\Elliptec\Thorlabs.Elliptec.ELLO_DLL.dll"
+
+# === DLL laden ===
+clr.AddReference(DLL_PATH)
+from Thorlabs.Elliptec.ELLO_DLL import ELLDevicePort, ELLDevices, ELLBaseDevice
+
+
+class ThorlabsElliptecBackend:
+
+    def __init__(self) -> None:
+        self._device = None
+        self._ell_devices = None
+        self._address: Optional[str] = None
+
+    def connect(self, port: str, min_address: str, max_address: str) -> list[str]:
+        ELLDevicePort.Connect(port)
+
+        ell_devices = ELLDevices()
+        devices = ell_devices.ScanAddresses(min_address, max_address)
+        if not devices:
+            raise RuntimeError("No Elliptec devices found on bus.")
+
+        addressed_device = None
+        for dev in devices:
+            if ell_devices.Configure(dev):
+                addressed_device = ell_devices.AddressedDevice(dev[0])
+                self._address = str(dev[0])
+                break
+
+        if addressed_device is None:
+            raise RuntimeError("No configurable Elliptec device found.")
+
+        self._ell_devices = ell_devices
+        self._device = addressed_device
+
+        return [str(line) for line in self._device.DeviceInfo.Description()]
+
+    @property
+    def address(self) -> Optional[str]:
+        return self._address
+
+    def home(self) -> None:
+        self._device.Home(ELLBaseDevice.DeviceDirection.Linear)
+
+    def move_relative(self, angle_deg: float) -> None:
+        self._device.MoveRelative(Decimal(angle_deg))
+
+    def read_position(self) -> Optional[float]:
+        try:
+            if not self._device.GetPosition():
+                return None
+            return Decimal.ToDouble(self._device.Position)
+        except Exception:
+            return None
+
+    def close(self) -> None:
+        try:
+            ELLDevicePort.Disconnect()
+        except Exception:
+            pass
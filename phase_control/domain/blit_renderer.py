@@ -0,0 +1,133 @@
+from typing import Optional, Sequence, TypeVar
+
+import numpy as np
+from matplotlib.artist import Artist
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+
+A = TypeVar("A", bound=Artist)
+
+
+class BlitRenderer:
+    """
+    Live redraw of a few changing artists on an otherwise static figure.
+
+    - add(artist): mark an artist as animated; it is left out of full
+      draws and drawn on top of the cached background instead
+    - render(): restore the cached background, draw the animated
+      artists and blit; a full draw happens only on the first call, after
+      a resize (the canvas emits a draw_event), after invalidate() or when
+      line data leaves the current axes limits
+
+    Limits only ever grow (with 'margin' headroom), so a noisy signal does
+    not trigger a full redraw every frame. Canvases without blitting
+    support fall back to draw_idle().
+    """
+
+    def __init__(self, fig: Figure, margin: float = 0.05) -> None:
+        self._fig = fig
+        self._canvas = fig.canvas
+        self._margin = margin
+        self._artists: list[Artist] = []
+        self._background = None
+
+        self.full_draws = 0
+        self.blits = 0
+
+        self._cid = self._canvas.mpl_connect("draw_event", self._on_draw)
+
+    def add(self, artist: A) -> A:
+        artist.set_animated(True)
+        self._artists.append(artist)
+        return artist
+
+    def render(self) -> None:
+        canvas = self._canvas
+
+        if not canvas.supports_blit:
+            self._grow_limits()
+            canvas.draw_idle()
+            canvas.flush_events()
+            return
+
+        if self._background is None or self._grow_limits():
+            self.draw_full()
+        else:
+            canvas.restore_region(self._background)
+            self._draw_artists()
+            canvas.blit(self._fig.bbox)
+            self.blits += 1
+
+        canvas.flush_events()
+
+    def invalidate(self) -> None:
+        """Full draw on the next render(), e.g. after an artist changed its axes limits."""
+        self._background = None
+
+    def draw_full(self) -> None:
+        """Redraw everything; the draw_event handler recaptures the background."""
+        self._canvas.draw()
+
+    def close(self) -> None:
+        self._canvas.mpl_disconnect(self._cid)
+
+    # ------------------------------------------------------------------ #
+    # internal helpers
+    # ------------------------------------------------------------------ #
+
+    def _on_draw(self, event: object) -> None:
+        self._background = self._canvas.copy_from_bbox(self._fig.bbox)
+        self._draw_artists()
+        self.full_draws += 1
+
+    def _draw_artists(self) -> None:
+        for artist in self._artists:
+            self._fig.draw_artist(artist)
+
+    def _grow_limits(self) -> bool:
+        """Widen the limits of every axes whose line data left them; True if any changed."""
+        changed = False
+        by_axes: dict[Axes, list[Line2D]] = {}
+        for artist in self._artists:
+            if isinstance(artist, Line2D) and artist.axes is not None and artist.get_visible():
+                by_axes.setdefault(artist.axes, []).append(artist)
+
+        for ax, lines in by_axes.items():
+            x_range = self._data_range([line.get_xdata() for line in lines])
+            y_range = self._data_range([line.get_ydata() for line in lines])
+            if x_range is not None and self._outside(ax.get_xlim(), x_range):
+                ax.set_xlim(*self._padded(ax.get_xlim(), x_range))
+                changed = True
+            if y_range is not None and self._outside(ax.get_ylim(), y_range):
+                ax.set_ylim(*self._padded(ax.get_ylim(), y_range))
+                changed = True
+        return changed
+
+    @staticmethod
+    def _data_range(columns: Sequence[np.ndarray]) -> Optional[tuple[float, float]]:
+        lows, highs = [], []
+        for data in columns:
+            data = np.asarray(data, dtype=float)
+            if data.size == 0:
+                continue
+            lows.append(np.nanmin(data))
+            highs.append(np.nanmax(data))
+        if not lows:
+            return None
+        low, high = float(min(lows)), float(max(highs))
+        if not (np.isfinite(low) and np.isfinite(high)):
+            return None
+        return low, high
+
+    @staticmethod
+    def _outside(limits: tuple[float, float], data: tuple[float, float]) -> bool:
+        lo, hi = min(limits), max(limits)
+        return data[0] < lo or data[1] > hi
+
+    def _padded(self, limits: tuple[float, float], data: tuple[float, float]) -> tuple[float, float]:
+        lo = min(min(limits), data[0])
+        hi = max(max(limits), data[1])
+        pad = self._margin * (hi - lo if hi > lo else 1.0)
+        return (lo - pad if data[0] < min(limits) else lo,
+                hi + pad if data[1] > max(limits) else hi)
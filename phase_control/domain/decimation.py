@@ -0,0 +1,93 @@
+from typing import Optional
+
+import numpy as np
+from matplotlib.lines import Line2D
+
+
+def minmax_indices(y: np.ndarray, bins: int) -> np.ndarray:
+    """
+    Indices of the min and the max of 'y' in each of 'bins' equal blocks,
+    in ascending order (2 per block). A line through them has the same
+    envelope as the full data at a resolution of 'bins' columns.
+
+    Returns all indices if there are no more than 2 points per bin.
+    """
+    n = len(y)
+    if bins < 1 or n <= 2 * bins:
+        return np.arange(n)
+
+    per_bin = n // bins
+    m = bins * per_bin
+    blocks = np.asarray(y[:m]).reshape(bins, per_bin)
+    base = np.arange(0, m, per_bin)
+    low = blocks.argmin(axis=1) + base
+    high = blocks.argmax(axis=1) + base
+    idx = np.stack([np.minimum(low, high), np.maximum(low, high)], axis=1).ravel()
+
+    if m < n:
+        # remainder shorter than one block: its own min/max pair
+        tail = np.asarray(y[m:])
+        low_t, high_t = int(tail.argmin()) + m, int(tail.argmax()) + m
+        idx = np.concatenate([idx, [min(low_t, high_t), max(low_t, high_t)]])
+    return idx
+
+
+class DecimatedLine:
+    """
+    Feeds a Line2D with a min/max decimated copy of the data.
+
+    - x is fixed (the spectrometer's wavelength or pixel axis)
+    - set_ydata(y): keep the full spectrum, draw ~2 points per pixel
+      column of the visible x range
+    - zoom, pan and resize recompute the decimation from the kept
+      spectrum, so zooming in reveals the full resolution again
+
+    Only points inside the current x limits are handed to the line, so
+    BlitRenderer never widens the limits back out after a zoom.
+    """
+
+    def __init__(self, line: Line2D, x: np.ndarray) -> None:
+        if line.axes is None:
+            raise ValueError("line must belong to an axes")
+        x = np.asarray(x, dtype=float)
+        self._reversed = len(x) > 1 and x[0] > x[-1]
+        self._x = x[::-1] if self._reversed else x
+        self._y: Optional[np.ndarray] = None
+        self.line = line
+        self._ax = line.axes
+
+        self._cids = [
+            self._ax.callbacks.connect("xlim_changed", self._on_limits),
+            self._ax.figure.canvas.mpl_connect("resize_event", self._on_limits),
+        ]
+
+    def set_ydata(self, y: np.ndarray) -> None:
+        y = np.asarray(y, dtype=float)
+        self._y = y[::-1] if self._reversed else y
+        self._update()
+
+    @property
+    def bins(self) -> int:
+        """Pixel columns of the axes."""
+        return max(int(self._ax.get_window_extent().width), 1)
+
+    def close(self) -> None:
+        self._ax.callbacks.disconnect(self._cids[0])
+        self._ax.figure.canvas.mpl_disconnect(self._cids[1])
+
+    # ------------------------------------------------------------------ #
+    # internal helpers
+    # ------------------------------------------------------------------ #
+
+    def _on_limits(self, event: object) -> None:
+        if self._y is not None:
+            self._update()
+
+    def _update(self) -> None:
+        assert self._y is not None
+        lo, hi = sorted(self._ax.get_xlim())
+        start = int(np.searchsorted(self._x, lo, side="left"))
+        stop = int(np.searchsorted(self._x, hi, side="right"))
+
+        idx = minmax_indices(self._y[start:stop], self.bins) + start
+        self.line.set_data(self._x[idx], self._y[idx])
@@ -0,0 +1,42 @@
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+def read_json(path: Path, parse: Callable[[Any], Optional[T]], what: str) -> Optional[T]:
+    """
+    parse() applied to the JSON content of 'path'. None if the file does
+    not exist; an unreadable file or content parse() rejects (OSError,
+    ValueError, KeyError, TypeError, AttributeError) is reported as
+    'what' and also gives None.
+    """
+    path = Path(path)
+    try:
+        return parse(json.loads(path.read_text(encoding="utf-8")))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as exc:
+        print(f"Ignoring unreadable {what} {path}: {exc}")
+        return None
+
+
+def atomic_write_json(path: Path, data: Any, what: str) -> None:
+    """
+    Write 'data' to a temporary file next to 'path' and replace it, so a
+    crash never leaves a half-written file behind. Failures are reported
+    as 'what' and not raised.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tmp.open("w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except OSError as exc:
+        print(f"Could not save {what} to {path}: {exc}")
@@ -0,0 +1,117 @@
+from typing import Optional
+
+import matplotlib
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.collections import PathCollection
+from matplotlib.image import AxesImage
+from matplotlib.transforms import Affine2D
+
+
+class WaterfallView:
+    """
+    Rolling waterfall, one image row per pushed spectrum, drawn as a
+    sweep: row 'i % history' holds spectrum 'i', so the newest row moves
+    up the image and wraps to the bottom. The row after it is blank and
+    marks the write position.
+
+    push() writes the row into the image's own array in place; nothing
+    is copied or re-masked per push, whatever the history length. Blank
+    rows hold -inf, drawn in an opaque "under" colour matching the axes
+    background; NaN, a mask or a transparent colour would each cost every
+    draw an extra pass over the image. Colour limits only grow, like
+    BlitRenderer's axes limits.
+    """
+
+    def __init__(self, ax: Axes, wavelengths_nm: np.ndarray, history: int, cmap: str = "viridis") -> None:
+        if history < 2:
+            raise ValueError("history must be >= 2")
+        wavelengths_nm = np.asarray(wavelengths_nm, dtype=float)
+        self._history = history
+        self._head = 0
+        self._clim: Optional[tuple[float, float]] = None
+
+        # float32 halves what imshow has to normalize and resample per draw
+        self.image: AxesImage = ax.imshow(
+            np.zeros((history, len(wavelengths_nm)), dtype=np.float32),
+            aspect="auto",
+            origin="lower",
+            interpolation="nearest",
+            cmap=matplotlib.colormaps[cmap].with_extremes(under=ax.get_facecolor()),
+            extent=(float(wavelengths_nm[0]), float(wavelengths_nm[-1]), 0, history),
+        )
+        # the image's own array; finite at creation, so it carries no mask
+        self._rows = self.image.get_array().data
+        self._rows[:] = -np.inf
+        self.image.set_clim(0.0, 1.0)   # until the first push, so -inf is "under"
+        ax.set_ylabel(f"Frame mod {history}")
+
+    def push(self, intensity: np.ndarray) -> None:
+        row = np.asarray(intensity, dtype=np.float32)
+        self._rows[self._head] = row
+        self._head = (self._head + 1) % self._history
+        self._rows[self._head] = -np.inf
+        self.image.stale = True
+        self._grow_clim(row)
+
+    def _grow_clim(self, row: np.ndarray) -> None:
+        if not np.isfinite(row).any():
+            return
+        low, high = float(np.nanmin(row)), float(np.nanmax(row))
+        if self._clim is None:
+            self._clim = (low, high if high > low else low + 1.0)
+        elif low < self._clim[0] or high > self._clim[1]:
+            self._clim = (min(low, self._clim[0]), max(high, self._clim[1]))
+        else:
+            return
+        self.image.set_clim(*self._clim)
+
+
+class PhaseHistoryView:
+    """
+    Strip chart of the phase (deg, wrapped to [-90, 90)) against seconds
+    before the newest sample.
+
+    Samples are markers of a scatter whose offsets (absolute time, phase)
+    are written in place at a rolling index; a translation in the offset
+    transform re-references the time axis to the newest sample. A push
+    is one row write, whatever the history length.
+
+    The time axis is widened by 'growth' whenever the history no longer
+    fits, so its limits (and a blitted background) change only a few
+    times until the history is full; push() returns True when they did.
+    """
+
+    def __init__(self, ax: Axes, history: int, growth: float = 1.5) -> None:
+        if history < 1:
+            raise ValueError("history must be >= 1")
+        self._ax = ax
+        self._growth = growth
+        self._history = history
+        self._head = 0
+        self._count = 0
+        self._span = 0.0
+
+        self._shift = Affine2D()
+        self.points: PathCollection = ax.scatter([], [], s=9, linewidths=0, transform=self._shift + ax.transData)
+        self.points.set_offsets(np.full((history, 2), np.nan))
+        self._samples = self.points.get_offsets()   # the collection's own array
+
+        ax.set_ylim(-90.0, 90.0)
+        ax.set_xlabel("Time [s]")
+        ax.set_ylabel("Phase [deg]")
+
+    def push(self, timestamp: float, phase_deg: float) -> bool:
+        self._samples[self._head] = (timestamp, (phase_deg + 90.0) % 180.0 - 90.0)
+        self._head = (self._head + 1) % self._history
+        self._count += 1
+        self._shift.clear().translate(-timestamp, 0.0)
+        self.points.stale = True
+
+        oldest = float(self._samples[self._head if self._count >= self._history else 0, 0])
+        age = timestamp - oldest
+        if age <= self._span:
+            return False
+        self._span = max(age, 1e-3) * self._growth
+        self._ax.set_xlim(-self._span, 0.0)
+        return True
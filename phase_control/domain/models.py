@@ -36,3 +36,30 @@ class Spectrum:
                 intensity.append(self.intensity[i])
                 
         return Spectrum(wave, intensity)     
+
+    def binned(self, factor: int) -> Spectrum:
+        """
+        Average groups of 'factor' neighbouring pixels (wavelength and
+        intensity). Trailing pixels that do not fill a group are dropped.
+        """
+        if factor <= 1:
+            return self
+
+        n = (len(self.wavelengths) // factor) * factor
+        wl = np.asarray(self.wavelengths_nm[:n], dtype=float).reshape(-1, factor).mean(axis=1)
+        counts = np.asarray(self.intensity[:n], dtype=float).reshape(-1, factor).mean(axis=1)
+
+        return Spectrum([Length(w, Prefix.NANO) for w in wl], counts.tolist())
+
+    def decimated(self, factor: int) -> Spectrum:
+        """
+        Keep the centre pixel of every group of 'factor' neighbouring pixels.
+        """
+        if factor <= 1:
+            return self
+
+        n = (len(self.wavelengths) // factor) * factor
+        idx = np.arange(factor // 2, n, factor)
+        counts = np.asarray(self.intensity, dtype=float)[idx]
+
+        return Spectrum([self.wavelengths[i] for i in idx], counts.tolist())
@@ -0,0 +1,69 @@
+import importlib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class StartupTimeline:
+    """
+    Wall-clock record of application startup (time.monotonic()).
+
+    - mark(label): a point in time, e.g. 'meta received'
+    - measure(label): a span around a with-block
+    - import_modules(names): import each module and record one span per
+      module, in order; a module's span only holds what an earlier one
+      has not already imported (the cumulative column of -X importtime)
+    - report(): all entries sorted by start, seconds since 'origin'
+
+    Thread-safe, so concurrent startup steps can record into one timeline.
+    """
+
+    def __init__(self, origin: Optional[float] = None) -> None:
+        self.origin = time.monotonic() if origin is None else origin
+        self._lock = threading.Lock()
+        self._entries: list[tuple[str, float, Optional[float], str]] = []   # label, start, end, thread
+
+    def mark(self, label: str, at: Optional[float] = None, source: Optional[str] = None) -> float:
+        """
+        Record 'label' now, or at the monotonic time 'at' (e.g. from the
+        acquisition process); 'source' replaces the thread name.
+        """
+        at = time.monotonic() if at is None else at
+        self._add(label, at, None, source)
+        return at - self.origin
+
+    @contextmanager
+    def measure(self, label: str) -> Iterator[None]:
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._add(label, start, time.monotonic())
+
+    def import_modules(self, names: list[str]) -> None:
+        for name in names:
+            with self.measure(f"import {name}"):
+                importlib.import_module(name)
+
+    def report(self) -> str:
+        with self._lock:
+            entries = sorted(self._entries, key=lambda e: e[1])
+
+        width = max((len(e[0]) for e in entries), default=0)
+        lines = ["Startup timeline (s since start):"]
+        for label, start, end, thread in entries:
+            t0 = start - self.origin
+            if end is None:
+                lines.append(f"  {label:<{width}}  {t0:7.3f}            [{thread}]")
+            else:
+                lines.append(f"  {label:<{width}}  {t0:7.3f} +{end - start:6.3f} s  [{thread}]")
+        return "\n".join(lines)
+
+    # ------------------------------------------------------------------ #
+    # internal helpers
+    # ------------------------------------------------------------------ #
+
+    def _add(self, label: str, start: float, end: Optional[float], source: Optional[str] = None) -> None:
+        with self._lock:
+            self._entries.append((label, start, end, source or threading.current_thread().name))
@@ -1,11 +1,13 @@
 # phase_control/stream_io/__init__.py
 from .models import StreamMeta, StreamFrame
+from .config import StreamHealthConfig
 from .frame_buffer import FrameBuffer
 from .stream_client import SpectrometerStreamClient
 
 __all__ = [
     "StreamMeta",
     "StreamFrame",
+    "StreamHealthConfig",
     "FrameBuffer",
     "SpectrometerStreamClient",
 ]
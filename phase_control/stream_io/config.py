@@ -0,0 +1,23 @@
+# phase_control/stream_io/config.py
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class StreamHealthConfig:
+    """
+    Supervision of the 32-bit acquisition process by SpectrometerStreamClient.
+
+    The process counts as hung when no frame arrives for
+    max(min_stall_timeout, stall_factor * expected gap), the expected gap
+    being the larger of exposure_ms * average (from the last 'config'
+    message) and the observed frame interval. A hung process, or one that
+    exits with a non-zero code, is restarted with the last config, at most
+    max_restarts times in a row (the count resets once frames flow again).
+    Exit code 0 (configuration window closed) ends the stream.
+    """
+    stderr_lines: int = 200             # stderr lines kept for error reports
+    stall_factor: float = 5.0
+    min_stall_timeout: float = 2.0      # s
+    meta_timeout: float = 30.0          # s, restarted process until its 'meta'
+    max_restarts: int = 5
+    restart_backoff: float = 1.0        # s, before the 2nd, 3rd, ... restart in a row
@@ -1,7 +1,7 @@
 # phase_control/stream_io/frame_buffer.py
 from multiprocessing import Value
 import threading
-from typing import Optional
+from typing import Callable, Optional
 
 import numpy as np
 
@@ -9,6 +9,9 @@ from phase_control.domain.models import Spectrum
 
 from .models import StreamFrame, StreamMeta
 
+# (exposure start, exposure end) -> True if the rotator moved in between
+MotionFilter = Callable[[float, float], bool]
+
 
 class FrameBuffer:
     """
@@ -16,17 +19,43 @@ class FrameBuffer:
 
     - update(frame): store a new frame (overwrites previous one)
     - get_latest(): return the most recent frame or None if nothing yet
+    - wait_next(): block until a frame newer than the last one returned
+      arrives; used by the analysis loop instead of polling
+
+    With a motion filter set (e.g. RotatorWorker.overlaps_motion), frames
+    whose exposure overlaps a rotator move are dropped in update(), so the
+    first clean frame after a move is the next one delivered.
     """
 
     def __init__(self, meta: StreamMeta) -> None:
         self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
         self._latest: Optional[StreamFrame] = None
+        self._sequence = 0
+        self._delivered = 0
+        self._motion_filter: Optional[MotionFilter] = None
         self.meta: StreamMeta = meta
 
+        self.skipped_in_motion = 0
+
+    def set_motion_filter(self, motion_filter: Optional[MotionFilter]) -> None:
+        """Drop frames for which 'motion_filter(start, end)' is True (None: keep all)."""
+        with self._lock:
+            self._motion_filter = motion_filter
+
     def update(self, frame: StreamFrame) -> None:
         """Store a new frame, overwriting any previous frame."""
-        with self._lock:
+        motion_filter = self._motion_filter
+        interval = frame.exposure_interval
+        if motion_filter is not None and interval is not None and motion_filter(*interval):
+            with self._lock:
+                self.skipped_in_motion += 1
+            return
+
+        with self._new_frame:
             self._latest = frame
+            self._sequence += 1
+            self._new_frame.notify_all()
 
     def get_latest(self) -> Spectrum:
         """
@@ -37,10 +66,23 @@ class FrameBuffer:
         with self._lock:
             return self._generate_Spectrogram(self._latest)
 
+    def wait_next(self, timeout: Optional[float] = None) -> Optional[StreamFrame]:
+        """
+        Next frame not yet returned by wait_next(), or None after 'timeout'.
+        Intermediate frames are skipped; only the newest one is returned.
+        """
+        with self._new_frame:
+            if not self._new_frame.wait_for(lambda: self._sequence > self._delivered, timeout):
+                return None
+            self._delivered = self._sequence
+            return self._latest
+
+    def to_spectrum(self, frame: StreamFrame) -> Spectrum:
+        return self._generate_Spectrogram(frame)
+
     def _generate_Spectrogram(self, frame: StreamFrame) -> Spectrum:
         if self.meta.wavelengths is not None:
             return Spectrum.from_raw_data(self.meta.wavelengths, frame.counts)
         else:
             raise ValueError("Wavelengths not readable.")
-        
-        
\ No newline at end of file
+
@@ -1,6 +1,6 @@
 # phase_control/stream_io/models.py
-from dataclasses import dataclass
-from typing import List, Optional
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 
 
 @dataclass
@@ -8,10 +8,14 @@ class StreamMeta:
     """
     Static information about the spectrometer stream.
     Sent once as the initial 'meta' JSON object.
+
+    startup: (label, time.monotonic()) of the acquisition process's
+    startup steps, for the startup report; empty if not sent.
     """
     device_index: int
     num_pixels: int
     wavelengths: Optional[List[float]]
+    startup: List[Tuple[str, float]] = field(default_factory=list)
 
 
 @dataclass
@@ -19,7 +23,22 @@ class StreamFrame:
     """
     One spectrum frame from the acquisition process.
     Corresponds to a 'frame' JSON object.
+
+    acquisition_start/_end and received_at are time.monotonic() values;
+    the clock is system-wide, so they compare directly with rotator
+    motion intervals.
     """
     timestamp: str          # ISO-8601 string
     device_index: int
     counts: List[int]
+    acquisition_start: Optional[float] = None
+    acquisition_end: Optional[float] = None
+    received_at: Optional[float] = None
+
+    @property
+    def exposure_interval(self) -> Optional[Tuple[float, float]]:
+        """(start, end) of the exposure, end falling back to the receive time."""
+        end = self.acquisition_end if self.acquisition_end is not None else self.received_at
+        if self.acquisition_start is None or end is None:
+            return None
+        return self.acquisition_start, end
@@ -4,22 +4,31 @@ Low-level stream client for the 32-bit acquisition process.
 
 Responsibilities:
 - start the 32-bit Python process running `acquisition.json_stream_server`
-- read the initial 'meta' JSON object
+- read the initial 'meta' JSON object (start(), or launch() + read_meta()
+  to overlap the process startup with other work)
 - provide an iterator over 'frame' JSON objects
+- drain the process's stderr into a bounded ring (a full pipe would
+  block the process), for error reports
+- watch the gaps between frames against the configured exposure and
+  restart a hung or crashed process with its last config, keeping the
+  cached StreamMeta (see StreamHealthConfig)
 - stop/terminate the process when done
 
 This module does NOT:
-- start any threads
 - manage any buffers or queues
 """
 
 import json
 import os
 import subprocess
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import Iterator, Optional
+from typing import Any, Deque, Dict, Iterator, List, Optional
 
 from acquisition.config import PYTHON32_PATH
+from .config import StreamHealthConfig
 from .models import StreamMeta, StreamFrame
 
 
@@ -28,7 +37,11 @@ class SpectrometerStreamClient:
     Stream client for the JSON output of the 32-bit acquisition process.
     """
 
-    def __init__(self, python32_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        python32_path: Optional[str] = None,
+        health: Optional[StreamHealthConfig] = StreamHealthConfig(),
+    ) -> None:
         """
         Parameters
         ----------
@@ -39,11 +52,32 @@ class SpectrometerStreamClient:
             1. explicit python32_path argument
             2. environment variable 'PYTHON32_PATH'
             3. acquisition.config.PYTHON32_PATH
+        health:
+            Stall detection and restart policy. None: no watchdog, the
+            frame iterator ends when the process does.
         """
         self.python32_path = PYTHON32_PATH
+        self.health = health
 
+        self._lock = threading.Lock()
         self._proc: Optional[subprocess.Popen[str]] = None
         self._meta: Optional[StreamMeta] = None
+        self._stopping = threading.Event()   # set by stop(): EOF is not a failure
+
+        self._stderr: Deque[str] = deque(maxlen=health.stderr_lines if health is not None else 200)
+        self._stderr_thread: Optional[threading.Thread] = None
+
+        # Watchdog state, shared with the watchdog thread. The process is
+        # killed if it sends nothing for '_silence_limit' seconds (None:
+        # not supervised, e.g. while the operator sets the first config).
+        self._last_activity = 0.0
+        self._silence_limit: Optional[float] = None
+        self._hang_reason: Optional[str] = None
+
+        self._last_config: Optional[Dict[str, Any]] = None
+        self._expected_gap: Optional[float] = None   # s, exposure_ms * average
+        self._observed_gap: Optional[float] = None   # s, smoothed frame interval
+        self.restarts = 0
 
     # ------------------------------------------------------------------ #
     # Properties
@@ -59,6 +93,11 @@ class SpectrometerStreamClient:
 
         return self._meta
 
+    @property
+    def stderr_tail(self) -> List[str]:
+        """Last stderr lines of the acquisition process (bounded)."""
+        return list(self._stderr)
+
     # ------------------------------------------------------------------ #
     # Lifecycle
     # ------------------------------------------------------------------ #
@@ -72,13 +111,128 @@ class SpectrometerStreamClient:
         StreamMeta
             Static meta information describing the stream.
         """
-        if self._proc is not None:
-            raise RuntimeError("Acquisition process is already running.")
+        self.launch()
+        return self.read_meta()
+
+    def launch(self) -> None:
+        """
+        Start the 32-bit acquisition process without waiting for it.
+
+        The process needs a while to load its DLL, open the device and take
+        the first spectrum; the caller can do its own setup meanwhile and
+        then call read_meta().
+        """
+        with self._lock:
+            if self._proc is not None:
+                raise RuntimeError("Acquisition process is already running.")
+            self._stopping.clear()
+            # The first start waits for the operator in the config window
+            self._spawn(config=None, silence_limit=None)
+
+    def read_meta(self) -> StreamMeta:
+        """
+        Block until the launched process sends its 'meta' frame.
+
+        Returns
+        -------
+        StreamMeta
+            Static meta information describing the stream.
+        """
+        proc = self._proc
+        if proc is None:
+            raise RuntimeError("Acquisition process is not running. Call launch() first.")
+
+        self._meta = self._read_meta(proc)
+        return self._meta
+
+    def frames(self) -> Iterator[StreamFrame]:
+        """
+        Iterate over frames from the acquisition process.
+
+        This is a blocking iterator. It should normally be called from a
+        background thread. It does NOT do any buffering itself.
+
+        Each frame is stamped with its receive time. If the acquisition
+        process does not send exposure timestamps, the previous frame's
+        receive time stands in for the start of the exposure.
+
+        The iterator ends when the process exits cleanly (operator closed
+        the configuration window). If it hangs or fails (non-zero exit
+        code), and stop() was not called, it is restarted with the last config and iteration continues; frames
+        keep the StreamMeta read at startup. The iterator ends after
+        max_restarts failed restarts in a row, or without a health config.
+        """
+        if self._proc is None:
+            raise RuntimeError("Acquisition process is not running. Call start() first.")
+
+        failures = 0
+        while True:
+            proc = self._proc
+            if proc is None:
+                return
+
+            for frame in self._read_frames(proc):
+                failures = 0
+                yield frame
+
+            if self._stopping.is_set():
+                return
+
+            returncode = proc.wait()
+            if self._hang_reason is None and returncode == 0:
+                # Configuration window closed: the operator ended acquisition
+                print("Acquisition process ended.")
+                return
+
+            reason = self._hang_reason or f"exited with code {returncode}"
+            if self.health is None:
+                print(f"Acquisition process {reason}.{self._format_stderr()}")
+                return
+            if failures >= self.health.max_restarts:
+                print(
+                    f"Acquisition process {reason}; giving up after {failures} "
+                    f"failed restarts.{self._format_stderr()}"
+                )
+                return
+
+            failures += 1
+            print(
+                f"Acquisition process {reason}; restarting "
+                f"({failures}/{self.health.max_restarts}).{self._format_stderr()}"
+            )
+            if failures > 1 and self._stopping.wait(self.health.restart_backoff):
+                return
+            if not self._restart():
+                return
+
+    def stop(self) -> None:
+        """
+        Terminate the acquisition process if it is still running.
+        """
+        with self._lock:
+            self._stopping.set()
+            proc = self._proc
+            self._proc = None
+
+        if proc is None:
+            return
+
+        _terminate(proc)
+
+    # ------------------------------------------------------------------ #
+    # internal helpers
+    # ------------------------------------------------------------------ #
 
+    def _spawn(self, config: Optional[Dict[str, Any]], silence_limit: Optional[float]) -> None:
+        """Start the process and its stderr drain / watchdog threads (caller holds _lock)."""
         repo_root = Path(__file__).resolve().parents[2]  # .../SPM-002
 
+        command = [self.python32_path, "-m", "acquisition.json_stream_server"]
+        if config is not None:
+            command += ["--config", json.dumps({"type": "config", **config})]
+
         proc = subprocess.Popen(
-            [self.python32_path, "-m", "acquisition.json_stream_server"],
+            command,
             cwd=str(repo_root),          # acquisition package visible for -m
             stdout=subprocess.PIPE,
             stdin=subprocess.DEVNULL,
@@ -87,45 +241,104 @@ class SpectrometerStreamClient:
             bufsize=1,                   # line-buffered
         )
         self._proc = proc
+        self._stderr.clear()
+        self._hang_reason = None
+        self._last_activity = time.monotonic()
+        self._silence_limit = silence_limit
+
+        self._stderr_thread = threading.Thread(
+            target=self._drain_stderr, args=(proc,), name="AcquisitionStderr", daemon=True,
+        )
+        self._stderr_thread.start()
+        if self.health is not None:
+            threading.Thread(
+                target=self._watch, args=(proc,), name="AcquisitionWatchdog", daemon=True,
+            ).start()
+
+    def _restart(self) -> bool:
+        """
+        Replace the current process by one started with the last config.
+        Returns False if stop() was called meanwhile or the new process
+        serves a different detector.
+        """
+        assert self.health is not None
+        with self._lock:
+            if self._stopping.is_set():
+                return False
+            old = self._proc
+            if old is not None:
+                _terminate(old)
+            self._spawn(config=self._last_config, silence_limit=self.health.meta_timeout)
+            proc = self._proc
+        assert proc is not None
 
+        started = time.monotonic()
+        try:
+            meta = self._read_meta(proc)
+        except RuntimeError as exc:
+            # The next pass of frames() sees EOF and counts another failure
+            print(f"Restarted acquisition process did not start: {exc}")
+            self._hang_reason = self._hang_reason or "sent no valid meta data"
+            _terminate(proc)
+            return True
+
+        if self._meta is not None and meta.num_pixels != self._meta.num_pixels:
+            print(
+                f"Restarted acquisition process reports {meta.num_pixels} pixels, "
+                f"expected {self._meta.num_pixels}; not continuing."
+            )
+            self.stop()
+            return False
+
+        self.restarts += 1
+        print(f"Acquisition process restarted ({time.monotonic() - started:.2f} s until meta).")
+        return True
+
+    def _read_meta(self, proc: "subprocess.Popen[str]") -> StreamMeta:
         if proc.stdout is None:
             raise RuntimeError("Failed to open stdout from acquisition process.")
 
         # Read one line (meta)
         meta_line = proc.stdout.readline()
+        self._silence_limit = None   # supervised again once frames() reads
         if not meta_line:
-            stderr_msg = ""
-            if proc.stderr is not None:
-                stderr_msg = proc.stderr.read()
+            proc.wait()
+            if self._stderr_thread is not None:
+                self._stderr_thread.join(timeout=1.0)
+            reason = self._hang_reason or "terminated"
             raise RuntimeError(
-                "Acquisition process terminated before sending meta data.\n"
-                f"stderr:\n{stderr_msg}"
+                f"Acquisition process {reason} before sending meta data.\n"
+                "stderr:\n" + "\n".join(self._stderr)
             )
 
-        meta_raw = json.loads(meta_line)
-        if meta_raw.get("type") != "meta":
+        try:
+            meta_raw = json.loads(meta_line)
+        except json.JSONDecodeError as exc:
+            raise RuntimeError(f"Expected meta frame, got non-JSON line: {meta_line!r}") from exc
+        if not isinstance(meta_raw, dict) or meta_raw.get("type") != "meta":
             raise RuntimeError(f"Expected meta frame, got: {meta_raw!r}")
 
-        self._meta = StreamMeta(
-            device_index=meta_raw["device_index"],
-            num_pixels=meta_raw["num_pixels"],
-            wavelengths=meta_raw["wavelengths"],  # may be None
-        )
-
-        return self._meta
+        try:
+            return StreamMeta(
+                device_index=meta_raw["device_index"],
+                num_pixels=meta_raw["num_pixels"],
+                wavelengths=meta_raw["wavelengths"],  # may be None
+                startup=[(str(label), float(t)) for label, t in meta_raw.get("startup", [])],
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            raise RuntimeError(f"Malformed meta frame ({exc!r}): {meta_raw!r}") from exc
 
-    def frames(self) -> Iterator[StreamFrame]:
-        """
-        Iterate over frames from the acquisition process.
+    def _read_frames(self, proc: "subprocess.Popen[str]") -> Iterator[StreamFrame]:
+        if proc.stdout is None:
+            raise RuntimeError("Failed to open stdout from acquisition process.")
 
-        This is a blocking iterator. It should normally be called from a
-        background thread. It does NOT do any buffering itself.
-        """
-        proc = self._proc
-        if proc is None or proc.stdout is None:
-            raise RuntimeError("Acquisition process is not running. Call start() first.")
+        last_received: Optional[float] = None
+        self._last_activity = time.monotonic()
+        self._silence_limit = self._stall_timeout()
 
         for line in proc.stdout:
+            received_at = time.monotonic()
+            self._last_activity = received_at
             line = line.strip()
             if not line:
                 continue
@@ -135,28 +348,81 @@ class SpectrometerStreamClient:
             except json.JSONDecodeError:
                 continue
 
-            if frame_raw.get("type") != "frame":
+            kind = frame_raw.get("type")
+            if kind == "config":
+                self._on_config(frame_raw)
+                continue
+            if kind != "frame":
                 continue  # ignore meta or other messages
 
+            if last_received is not None:
+                gap = received_at - last_received
+                self._observed_gap = gap if self._observed_gap is None else 0.8 * self._observed_gap + 0.2 * gap
+                self._silence_limit = self._stall_timeout()
+
+            acquisition_start = frame_raw.get("acq_start")
+            if acquisition_start is None:
+                acquisition_start = last_received
+            last_received = received_at
+
             yield StreamFrame(
                 timestamp=frame_raw["timestamp"],
                 device_index=frame_raw["device_index"],
                 counts=frame_raw["counts"],
+                acquisition_start=acquisition_start,
+                acquisition_end=frame_raw.get("acq_end"),
+                received_at=received_at,
             )
 
-    def stop(self) -> None:
-        """
-        Terminate the acquisition process if it is still running.
-        """
-        proc = self._proc
-        self._proc = None
+    def _on_config(self, message: Dict[str, Any]) -> None:
+        self._last_config = {k: v for k, v in message.items() if k != "type"}
+        try:
+            self._expected_gap = float(message["exposure_ms"]) * max(int(message.get("average", 1)), 1) / 1000.0
+        except (KeyError, TypeError, ValueError):
+            self._expected_gap = None
+        self._silence_limit = self._stall_timeout()
 
-        if proc is None:
+    def _stall_timeout(self) -> Optional[float]:
+        if self.health is None:
+            return None
+        gap = max(self._expected_gap or 0.0, self._observed_gap or 0.0)
+        return max(self.health.min_stall_timeout, self.health.stall_factor * gap)
+
+    def _drain_stderr(self, proc: "subprocess.Popen[str]") -> None:
+        if proc.stderr is None:
             return
+        for line in proc.stderr:
+            self._stderr.append(line.rstrip("\n"))
 
-        if proc.poll() is None:
-            proc.terminate()
+    def _watch(self, proc: "subprocess.Popen[str]") -> None:
+        """Kill 'proc' when it stays silent past the limit; frames() then sees EOF."""
+        while self._proc is proc:
             try:
-                proc.wait(timeout=5)
+                proc.wait(timeout=0.1)
+                return
             except subprocess.TimeoutExpired:
+                pass
+
+            limit = self._silence_limit
+            if limit is None:
+                continue
+            silent = time.monotonic() - self._last_activity
+            if silent > limit:
+                self._hang_reason = f"sent nothing for {silent:.1f} s (limit {limit:.1f} s)"
                 proc.kill()
+                return
+
+    def _format_stderr(self, lines: int = 20) -> str:
+        tail = list(self._stderr)[-lines:]
+        if not tail:
+            return ""
+        return "\nstderr (last lines):\n" + "\n".join(f"  {line}" for line in tail)
+
+
+def _terminate(proc: "subprocess.Popen[str]") -> None:
+    if proc.poll() is None:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
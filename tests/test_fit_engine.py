@@ -0,0 +1,41 @@
+import math
+
+import numpy as np
+
+from base_lib.functions import usCFG_projection
+from base_lib.models import Length, Prefix
+from phase_control.analysis.config import AnalysisConfig
+from phase_control.analysis.fit_engine import FitEngine
+from phase_control.domain.models import Spectrum
+
+WAVELENGTHS = np.arange(795.0, 810.0, 0.03)
+
+
+def _sin4_model(x, carrier_wavelength, starting_wavelength, bandwidth, baseline, phase, acceleration):
+    # not of the sin² form PhaseModelCache decomposes
+    envelope = np.exp(-4.0 * math.log(2.0) * (x - carrier_wavelength) ** 2 / bandwidth**2)
+    return baseline + (1.0 - baseline) * envelope * np.sin(phase + acceleration * (x - starting_wavelength) ** 2) ** 4
+
+
+def _fit_phase(func, capsys) -> tuple[float, str]:
+    config = AnalysisConfig()
+    kwargs = config.to_fit_kwargs(func)
+    truth = kwargs["phase"] + 0.3
+    y = func(WAVELENGTHS, **{**kwargs, "phase": truth})
+    spectrum = Spectrum([Length(w, Prefix.NANO) for w in WAVELENGTHS], list(y))
+
+    capsys.readouterr()
+    phase = FitEngine(func).fit_phase(spectrum, config).best_values["phase"]
+    return phase - truth, capsys.readouterr().out
+
+
+def test_phase_fit_uses_cache_for_us_cfg(capsys):
+    error, out = _fit_phase(usCFG_projection, capsys)
+    assert abs(error) < 1e-6
+    assert "does not match" not in out
+
+
+def test_phase_fit_falls_back_for_other_models(capsys):
+    error, out = _fit_phase(_sin4_model, capsys)
+    assert abs(error) < 1e-6
+    assert "Cached phase model does not match" in out
@@ -0,0 +1,61 @@
+import math
+from types import SimpleNamespace
+
+import numpy as np
+
+from base_lib.functions import usCFG_projection
+from base_lib.models import Angle, AngleUnit
+from phase_control.analysis.config import AnalysisConfig, CalibrationConfig
+from phase_control.analysis.hwp_calibration import HwpCalibrator
+from phase_control.correction_io.config import SimulatedRotatorConfig
+from phase_control.correction_io.elliptec_ell14 import ANGLE_RANGE, ElliptecRotator
+from phase_control.correction_io.rotator_worker import RotatorWorker
+from phase_control.correction_io.simulated_elliptec import SimulatedElliptecBackend
+
+WAVELENGTHS = np.arange(795.0, 810.0, 0.03)
+GAIN = 4.0          # deg phase per deg HWP
+OFFSET_DEG = 10.0
+
+FAST_ROTATOR = SimulatedRotatorConfig(
+    speed_deg_per_s=2000.0,
+    command_latency=0.0,
+    settle_time=0.0,
+    connect_time=0.0,
+    scan_time_per_address=0.0,
+)
+
+
+class _SyntheticCalibrator(HwpCalibrator):
+    """Bursts from the usCFG model at the phase the rotator's reported angle implies."""
+
+    bursts = 0
+
+    def _collect(self, rotator, buffer, tracker):
+        self.bursts += 1
+        angle = self._angle(rotator)
+        kwargs = tracker.config.to_fit_kwargs(usCFG_projection)
+        kwargs["phase"] = math.radians(OFFSET_DEG + GAIN * angle)
+        row = usCFG_projection(WAVELENGTHS, **kwargs)
+        return WAVELENGTHS, np.stack([row] * self._settings.burst), float(self.bursts)
+
+
+def test_sweep_near_range_end_stays_in_range():
+    worker = RotatorWorker(lambda: ElliptecRotator(backend=SimulatedElliptecBackend(FAST_ROTATOR)))
+    try:
+        worker.ready.result(timeout=10)
+        worker.rotate(Angle(85, AngleUnit.DEG)).result(timeout=10)
+        start = worker.submit(lambda r: r.angle.Deg).result()
+
+        calibrator = _SyntheticCalibrator(CalibrationConfig(span_deg=12.0, steps=7, burst=2))
+        targets = calibrator.sweep_targets(start)
+        assert targets.max() < ANGLE_RANGE.max.Deg
+        assert targets.min() > ANGLE_RANGE.min.Deg
+
+        tracker = SimpleNamespace(config=AnalysisConfig())
+        calibration = calibrator.run(worker, buffer=None, tracker=tracker)
+
+        assert abs(calibration.phase_per_hwp_deg - GAIN) < 0.05
+        assert calibration.residual_deg < 0.5
+        assert abs(worker.submit(lambda r: r.angle.Deg).result() - start) < 0.5
+    finally:
+        worker.close()
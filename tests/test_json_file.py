@@ -0,0 +1,41 @@
+import numpy as np
+
+from phase_control.analysis.config import AnalysisConfig
+from phase_control.analysis.hwp_calibration import CalibrationStore, HwpCalibration
+from phase_control.analysis.warm_start import WarmStartStore
+from phase_control.correction_io.address_cache import ElliptecAddressCache
+from phase_control.domain.json_file import atomic_write_json, read_json
+
+
+def test_round_trip_and_missing_file(tmp_path):
+    path = tmp_path / "sub" / "data.json"
+    assert read_json(path, dict, "test file") is None
+
+    atomic_write_json(path, {"a": 1}, "test file")
+    assert read_json(path, dict, "test file") == {"a": 1}
+    assert not path.with_name("data.json.tmp").exists()
+
+
+def test_unreadable_file_gives_none(tmp_path, capsys):
+    path = tmp_path / "data.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert read_json(path, dict, "test file") is None
+    assert "Ignoring unreadable test file" in capsys.readouterr().out
+
+    path.write_text("{}", encoding="utf-8")
+    assert read_json(path, lambda raw: raw["missing"], "test file") is None
+
+
+def test_stores_share_the_helper(tmp_path):
+    warm = WarmStartStore(tmp_path / "warm.json")
+    warm.save(AnalysisConfig(), 0.25, np.arange(3.0))
+    assert warm.load().residual == 0.25
+
+    calibrations = CalibrationStore(tmp_path / "hwp.json")
+    calibrations.save(HwpCalibration(4.0, 1.0, 0.1, 21, "now"))
+    assert calibrations.load().phase_per_hwp_deg == 4.0
+
+    addresses = ElliptecAddressCache(tmp_path / "address.json")
+    addresses.save("COM6", "3")
+    assert addresses.load("COM6") == "3"
+    assert addresses.load("COM7") is None
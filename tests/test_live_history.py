@@ -0,0 +1,65 @@
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from phase_control.domain.live_history import PhaseHistoryView, WaterfallView
+
+PIXELS = 2048
+
+
+def _push_seconds(history: int, pushes: int = 300) -> float:
+    """Median time of one waterfall + strip chart push."""
+    fig, (ax_waterfall, ax_phase) = plt.subplots(2)
+    try:
+        waterfall = WaterfallView(ax_waterfall, np.linspace(795.0, 810.0, PIXELS), history)
+        phase = PhaseHistoryView(ax_phase, history)
+        row = np.random.default_rng(0).random(PIXELS)
+
+        samples = []
+        for i in range(pushes):
+            t0 = time.perf_counter()
+            waterfall.push(row)
+            phase.push(0.01 * i, 10.0)
+            samples.append(time.perf_counter() - t0)
+        return float(np.median(samples))
+    finally:
+        plt.close(fig)
+
+
+def test_push_cost_does_not_grow_with_history():
+    _push_seconds(100, pushes=20)   # warm up
+    small = _push_seconds(100)
+    large = _push_seconds(10000)
+    assert large < 3.0 * small + 20e-6, f"push {small * 1e6:.1f} us at 100 rows, {large * 1e6:.1f} us at 10000"
+
+
+def test_waterfall_rows_wrap_with_blank_row_after_newest():
+    fig, ax = plt.subplots()
+    try:
+        waterfall = WaterfallView(ax, np.linspace(795.0, 810.0, 8), history=5)
+        for i in range(7):
+            waterfall.push(np.full(8, float(i)))
+        rows = waterfall.image.get_array()[:, 0]
+        np.testing.assert_array_equal(rows, [5.0, 6.0, -np.inf, 3.0, 4.0])
+    finally:
+        plt.close(fig)
+
+
+def test_phase_history_is_relative_to_newest_sample():
+    fig, ax = plt.subplots()
+    try:
+        phase = PhaseHistoryView(ax, history=4)
+        for i in range(6):
+            phase.push(100.0 + i, 100.0)   # wraps to -80
+        shifted = phase.points.get_offset_transform() - ax.transData
+        x, y = shifted.transform(phase.points.get_offsets()).T
+        np.testing.assert_allclose(sorted(x), [-3.0, -2.0, -1.0, 0.0])
+        np.testing.assert_allclose(y, -80.0)
+        assert ax.get_xlim()[0] <= -3.0
+    finally:
+        plt.close(fig)
@@ -0,0 +1,52 @@
+import math
+from dataclasses import replace
+
+import numpy as np
+
+from base_lib.functions import usCFG_projection
+from phase_control.analysis.config import AnalysisConfig, WarmStartConfig
+from phase_control.analysis.phase_tracker import PhaseTracker
+from phase_control.analysis.warm_start import WarmStartStore
+from phase_control.domain.models import Spectrum
+
+WAVELENGTHS = np.arange(795.0, 810.0, 0.03)
+
+
+def _spectrum(phase_deg: float, noise: float, seed: int) -> Spectrum:
+    kwargs = AnalysisConfig().to_fit_kwargs(usCFG_projection)
+    y = usCFG_projection(WAVELENGTHS, **{**kwargs, "phase": math.radians(phase_deg)})
+    y = y * (1 + noise * np.random.default_rng(seed).standard_normal(len(WAVELENGTHS)))
+    return Spectrum.from_raw_data(list(WAVELENGTHS), list(np.round(4000 * y)))
+
+
+def test_warm_start_does_not_ratchet_saved_residual(tmp_path, capsys):
+    path = tmp_path / "warm_start.json"
+    config = replace(
+        AnalysisConfig(),
+        multi_start=None,
+        drift_refit=None,
+        phase_prediction=None,
+        warm_start=WarmStartConfig(path=path, tolerance=1.5),
+    )
+    store = WarmStartStore(path)
+
+    PhaseTracker(config).update(_spectrum(40.0, noise=0.01, seed=0))
+    reference = store.load()
+    assert reference is not None
+
+    # Each session is 1.3x noisier than the last: within tolerance of the
+    # previous session, but not of the full fit after a few sessions.
+    warm_started = []
+    for session in range(1, 6):
+        capsys.readouterr()
+        PhaseTracker(config).update(_spectrum(40.0 + session, noise=0.01 * 1.3 ** session, seed=session))
+        warm = "Warm start from" in capsys.readouterr().out
+        warm_started.append(warm)
+
+        if not warm:
+            break
+        # a warm start keeps the full fit's record
+        assert store.load() == reference
+
+    assert warm_started[0]
+    assert not warm_started[-1], "warm start accepted a fit far worse than the full fit"